@@ -74,6 +74,7 @@ USAGE:
 
 CUSTOMIZATION:
     - Modify 'prompts' dictionary to match your assignments
+    - Adjust keyword lists in the KEYWORD TABLES section
     - Adjust grading criteria in grade_answer() function
     - Change color thresholds in the Excel formatting section
     - Modify response preview length (currently 100 characters)
@@ -92,10 +93,18 @@ EXAMPLE WORKFLOW:
     5. Make manual adjustments as needed in gradebook
 """
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
-import csv
+from openpyxl.formatting.rule import CellIsRule
+import os
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from functools import lru_cache
+from roster_utils import (load_roster_cached, clean_roster, split_student_name, email_key,
+                          match_submissions, NON_LETTERS)
 
 # ============================================================================
 # CONFIGURATION - UPDATE FOR YOUR ASSIGNMENT
@@ -140,34 +149,171 @@ master_roster_path = '/mnt/user-data/outputs/Master_Class_Roster_Spring_2026.xls
 # Output path - UPDATE IF NEEDED
 output_path = '/mnt/user-data/outputs/Write_it_Wednesday_Week_1_Grades.xlsx'
 
+# Fuzzy matching for students with no email containing their full first and
+# last name. The email must still contain the exact last name; the rest of
+# it must be the first initial (jsmith@ for John Smith) or at least this
+# similar (0-1) to the first name (jonsmith@). Raise it if students get
+# mixed up. Fuzzy matches are marked in the Email column for review.
+FUZZY_MATCH_CUTOFF = 0.75
+
+# Responses shorter than this (blank, "idk", a single word) score 0/6
+# without being checked against the rubric
+MIN_RESPONSE_LENGTH = 10
+
+# ============================================================================
+# KEYWORD TABLES - CUSTOMIZE CRITERIA HERE
+# ============================================================================
+# Built once when the script loads and shared by every call to grade_answer().
+# All keywords must be lowercase (responses are lowercased before matching).
+
+# Key concepts looked for in the ANSWER component, by period
+ANSWER_KEYWORDS = {
+    1: ('magma', 'lava', 'pressure', 'gas'),
+    3: ('fur', 'hair', 'warm', 'live', 'birth', 'milk'),
+    4: ('mass', 'weight', 'distance', 'center'),
+    5: ('safe', 'fair', 'treat', 'conflict', 'order'),
+}
+
+# Citation phrases for the CITE component
+CITE_PHRASES = (
+    'author states', 'article states', 'passage', 'according to',
+    'text states', 'paragraph', 'excerpt', 'states that', 'mentions',
+    'the text', 'the article', 'the passage'
+)
+
+# Quotation marks for the CITE component: straight and curly double quotes.
+# Single quotes are left out because apostrophes ("it's", "don\u2019t") use
+# the same characters and would earn citation credit on their own.
+QUOTE_MARKS = ('"', '\u201c', '\u201d')
+
+# Explanation/connection words for the EXPLAIN component
+EXPLAIN_PHRASES = (
+    'this shows', 'this proves', 'this means', 'therefore',
+    'because', 'which causes', 'as a result', 'this demonstrates',
+    'this explains', 'validates', 'supports', 'connected', 'since',
+    'thus', 'hence', 'consequently'
+)
+
+def find_keywords(text, keywords):
+    """
+    Find which keywords appear in a (lowercased) text.
+    
+    Each keyword is searched for exactly once, so the scoring logic can use
+    cheap set-membership tests instead of repeating substring scans.
+    
+    Args:
+        text (str): Lowercased text to search
+        keywords (iterable): Lowercase keywords/phrases to look for
+        
+    Returns:
+        frozenset: The keywords found in the text
+    """
+    return frozenset(keyword for keyword in keywords if keyword in text)
+
 # ============================================================================
 # GRADING FUNCTION - CUSTOMIZE CRITERIA HERE
 # ============================================================================
 
-def grade_answer(response, question, period):
+def count_sentences(text):
+    """
+    Count substantial and incomplete sentences in a single pass.
+    
+    Sentences are the pieces of text between periods. A piece longer than
+    10 characters (ignoring surrounding whitespace) is substantial; a
+    non-empty piece shorter than 10 characters is incomplete.
+    
+    Args:
+        text (str): Text to analyze
+        
+    Returns:
+        tuple: (sentence_count, incomplete_count)
+    """
+    sentence_count = 0
+    incomplete_count = 0
+    start = 0
+    while True:
+        # Walk from one period to the next instead of splitting the text
+        # into a list; the last piece runs to the end of the text
+        end = text.find('.', start)
+        piece = text[start:] if end == -1 else text[start:end]
+        length = len(piece.strip())
+        if length > 10:
+            sentence_count += 1
+        elif 0 < length < 10:
+            incomplete_count += 1
+        if end == -1:
+            return sentence_count, incomplete_count
+        start = end + 1
+
+def score_core(response, period):
+    """
+    Scan a response for every text feature the rubric uses.
+    
+    All of the string work for grading happens here, in one place, so
+    grade_answer() only has to apply point thresholds to the results.
+    
+    Args:
+        response (str): Student's written response
+        period (int): Class period (selects the answer keywords)
+        
+    Returns:
+        tuple: (answer keywords found, has_citation, has_explanation,
+                sentence_count, incomplete_count)
+    """
+    response_lower = response.lower()
+    
+    # Scan once for this period's answer keywords
+    found = find_keywords(response_lower, ANSWER_KEYWORDS.get(period, ()))
+    
+    # Check for quotation marks (various unicode versions) or citation
+    # phrases - either one earns full cite credit, so the phrase scan is
+    # skipped when the response already quotes the text
+    has_citation = (any(mark in response for mark in QUOTE_MARKS)
+                    or any(phrase in response_lower for phrase in CITE_PHRASES))
+    
+    # Check for explanation/connection words
+    has_explanation = any(phrase in response_lower for phrase in EXPLAIN_PHRASES)
+    
+    # Count substantial and incomplete sentences
+    sentence_count, incomplete_count = count_sentences(response)
+    
+    return (found, has_citation, has_explanation,
+            sentence_count, incomplete_count)
+
+@lru_cache(maxsize=2048)
+def grade_answer(response, period):
     """
     Grade a student response based on ACE rubric.
     
+    Results are cached, so identical responses (blank or copy-paste
+    answers, or re-running while tuning criteria) are only scored once.
+    
     Args:
         response (str): Student's written response
-        question (str): The question that was asked
         period (int): Class period (determines question-specific criteria)
         
     Returns:
-        dict: Scores for answer, cite, explain, and total
+        tuple: (answer_score, cite_score, explain_score, total_score).
+               A tuple rather than a dict so cached results can't be modified.
     """
-    response_lower = response.lower()
+    # Too short to be a real attempt - skip all the rubric checks
+    if len(response) < MIN_RESPONSE_LENGTH:
+        return 0, 0, 0, 0
+    
+    (found, has_citation, has_explanation,
+     sentence_count, incomplete_sentences) = score_core(response, period)
     
     # ========================================================================
     # ANSWER SCORING (0-2 points)
     # ========================================================================
     # Check if the response addresses the specific question asked
     # Customize this section for each period's question
+    # (keywords used here must also be listed in ANSWER_KEYWORDS above)
     
     if period == 1:
         # Period 1: Volcanoes - need difference between magma/lava + pressure cause
-        has_difference = ('magma' in response_lower and 'lava' in response_lower)
-        has_pressure = ('pressure' in response_lower or 'gas' in response_lower)
+        has_difference = ('magma' in found and 'lava' in found)
+        has_pressure = ('pressure' in found or 'gas' in found)
         if has_difference and has_pressure:
             answer_score = 2
         elif has_difference or has_pressure:
@@ -178,10 +324,10 @@ def grade_answer(response, question, period):
     elif period == 3:
         # Period 3: Mammals - need four characteristics
         characteristics = [
-            'fur' in response_lower or 'hair' in response_lower,
-            'warm' in response_lower,
-            'live' in response_lower or 'birth' in response_lower,
-            'milk' in response_lower
+            'fur' in found or 'hair' in found,
+            'warm' in found,
+            'live' in found or 'birth' in found,
+            'milk' in found
         ]
         char_count = sum(characteristics)
         if char_count >= 4:
@@ -193,9 +339,9 @@ def grade_answer(response, question, period):
             
     elif period == 4:
         # Period 4: Gravity - need mass, distance, and Earth's center
-        has_factors = (('mass' in response_lower or 'weight' in response_lower) and 
-                      'distance' in response_lower)
-        has_center = 'center' in response_lower
+        has_factors = (('mass' in found or 'weight' in found) and 
+                      'distance' in found)
+        has_center = 'center' in found
         if has_factors and has_center:
             answer_score = 2
         elif has_factors or has_center:
@@ -206,9 +352,9 @@ def grade_answer(response, question, period):
     elif period == 5:
         # Period 5: Rules/Laws - need two purposes
         purposes = [
-            'safe' in response_lower,
-            'fair' in response_lower or 'treat' in response_lower,
-            'conflict' in response_lower or 'order' in response_lower
+            'safe' in found,
+            'fair' in found or 'treat' in found,
+            'conflict' in found or 'order' in found
         ]
         purpose_count = sum(purposes)
         if purpose_count >= 2:
@@ -223,22 +369,9 @@ def grade_answer(response, question, period):
     # ========================================================================
     # CITE SCORING (0-2 points)
     # ========================================================================
-    # Look for evidence of text citation
-    
-    # Check for quotation marks (various unicode versions)
-    has_quotes = '"' in response or '"' in response or '"' in response or "'" in response
-    
-    # Check for citation phrases
-    cite_phrases = [
-        'author states', 'article states', 'passage', 'according to', 
-        'text states', 'paragraph', 'excerpt', 'states that', 'mentions',
-        'the text', 'the article', 'the passage'
-    ]
-    has_cite_language = any(phrase in response_lower for phrase in cite_phrases)
-    
-    if has_quotes and has_cite_language:
-        cite_score = 2
-    elif has_quotes or has_cite_language:
+    # Look for evidence of text citation (quotes or citation phrases)
+    
+    if has_citation:
         cite_score = 2  # Being generous - either method shows citation attempt
     elif len(response) > 100:  # At least attempted substantial response
         cite_score = 1
@@ -250,18 +383,8 @@ def grade_answer(response, question, period):
     # ========================================================================
     # Look for logical connection between evidence and answer
     
-    # Check for explanation/connection words
-    explain_phrases = [
-        'this shows', 'this proves', 'this means', 'therefore', 
-        'because', 'which causes', 'as a result', 'this demonstrates',
-        'this explains', 'validates', 'supports', 'connected', 'since',
-        'thus', 'hence', 'consequently'
-    ]
-    has_explanation = any(phrase in response_lower for phrase in explain_phrases)
-    
     # Check for logical structure (multiple sentences)
-    sentences = [s for s in response.split('.') if len(s.strip()) > 10]
-    has_structure = len(sentences) >= 3  # At least 3 substantial sentences
+    has_structure = sentence_count >= 3  # At least 3 substantial sentences
     
     if has_explanation and has_structure:
         explain_score = 2
@@ -273,11 +396,8 @@ def grade_answer(response, question, period):
     # ========================================================================
     # QUALITY CHECK - Penalize very poor quality
     # ========================================================================
-    # Check for major quality issues
-    incomplete_sentences = sum(1 for s in response.split('.') if 0 < len(s.strip()) < 10)
-    
     # Penalize if response is too short or mostly incomplete sentences
-    if len(response) < 50 or (len(sentences) > 0 and incomplete_sentences > len(sentences)):
+    if len(response) < 50 or (sentence_count > 0 and incomplete_sentences > sentence_count):
         # Reduce answer score for poor quality
         if answer_score > 0:
             answer_score = max(0, answer_score - 1)
@@ -285,201 +405,297 @@ def grade_answer(response, question, period):
     # Calculate total
     total_score = answer_score + cite_score + explain_score
     
-    return {
-        'answer_score': answer_score,
-        'cite_score': cite_score,
-        'explain_score': explain_score,
-        'total_score': total_score
-    }
+    return answer_score, cite_score, explain_score, total_score
 
 # ============================================================================
-# MAIN GRADING PROCESS
+# EMAIL MATCHING
 # ============================================================================
 
-# Load master roster to get all students
-print("Loading master roster...")
-master_roster = pd.read_excel(master_roster_path)
-
-# Storage for all grades
-all_grades = []
-
-# Process each period's submissions
-for file_path, period in form_files:
-    print(f"\n{'=' * 70}")
-    print(f"Grading Period {period} - {prompts[period]['topic']}")
-    print("=" * 70)
+def find_fuzzy_match(first_name, last_name, candidates):
+    """
+    Find the email most similar to a student's name.
     
-    # Read Google Form responses
-    with open(file_path, 'r') as f:
-        reader = csv.DictReader(f)
-        responses = list(reader)
+    Used only for students that match_submissions() could not match, to catch
+    emails like jsmith@, smith.j@ or jonsmith@ (for John Smith). The email
+    must start or end with the student's exact last name, so a classmate
+    with a similar name (jane.smith@ for John Smith) is never picked. What
+    is left must be the first initial or similar enough to the first name
+    (see FUZZY_MATCH_CUTOFF).
     
-    # Create dictionary of submissions by email
-    submissions = {}
-    for response in responses:
-        email = response['Username'].strip().lower()
-        answer_text = response[list(response.keys())[2]]  # Third column is the answer
-        submissions[email] = answer_text
-    
-    # Get all students for this period from master roster
-    period_students = master_roster[master_roster['Period'] == period]
-    
-    # Grade each student (or mark as no submission)
-    for _, student in period_students.iterrows():
-        student_name = student['Student Name']
+    Args:
+        first_name (str): Normalized (lowercase) first name
+        last_name (str): Normalized (lowercase) last name
+        candidates (dict): email_key -> email, for emails not yet matched
         
-        # Extract name parts for email matching
-        if ',' in student_name:
-            last_name, first_name = student_name.split(',', 1)
-            last_name = last_name.strip().lower().replace(' ', '').replace('-', '')
-            first_name = first_name.strip().lower().replace(' ', '').replace('-', '')
+    Returns:
+        str: The best matching key in candidates, or None
+    """
+    first_name = NON_LETTERS.sub('', first_name)
+    last_name = NON_LETTERS.sub('', last_name)
+    if not first_name or not last_name:
+        return None
+    
+    best_key = None
+    best_score = 0
+    for key in candidates:
+        if key.endswith(last_name):
+            rest = key[:-len(last_name)]
+        elif key.startswith(last_name):
+            rest = key[len(last_name):]
         else:
-            parts = student_name.split()
-            if len(parts) >= 2:
-                first_name = parts[0].lower()
-                last_name = ' '.join(parts[1:]).lower().replace(' ', '').replace('-', '')
-            else:
-                first_name = student_name.lower()
-                last_name = ""
+            continue
+        if not rest:
+            continue
+        score = SequenceMatcher(None, rest, first_name).ratio()
+        if rest != first_name[0] and score < FUZZY_MATCH_CUTOFF:
+            continue
+        if best_key is None or score > best_score:
+            best_key, best_score = key, score
+    return best_key
+
+# ============================================================================
+# PER-PERIOD GRADING
+# ============================================================================
+
+def grade_period(file_path, period, period_students):
+    """
+    Match and grade one period's Google Form submissions.
+    
+    Periods share no data, so each one is graded in its own worker process.
+    Nothing is printed here; results go back to the main process, which
+    prints them in period order.
+    
+    Args:
+        file_path (str): Path to this period's Google Form CSV
+        period (int): Class period (determines question-specific criteria)
+        period_students (list): Roster names for this period only
         
-        # Find matching submission
-        found_submission = None
-        matched_email = None
-        for email, answer_text in submissions.items():
-            email_lower = email.lower()
-            if first_name in email_lower and last_name in email_lower:
-                found_submission = answer_text
-                matched_email = email
-                break
+    Returns:
+        list: One tuple per student, in roster order:
+              (student_name, email, answer_score, cite_score, explain_score,
+               total_score, response_preview, fuzzy_matched).
+              email is None for students with no submission.
+    """
+    # Read Google Form responses (only the Username and answer columns)
+    # Blank answers stay as empty strings so they count as no submission
+    responses = pd.read_csv(file_path, usecols=[1, 2], dtype=str, keep_default_na=False)
+    
+    # Create dictionary of submissions by email
+    emails = responses['Username'].str.strip().str.lower()
+    answers = responses.iloc[:, 1]  # Third column is the answer
+    submissions = dict(zip(emails, answers))
+    
+    # Extract name parts for email matching
+    name_parts = [split_student_name(student_name) for student_name in period_students]
+    
+    # Find matching submissions (emails are already lowercased); each
+    # email is claimed by at most one student
+    matches = match_submissions(name_parts, submissions)
+    
+    # Fuzzy-match students still missing, but only against emails that no
+    # other student matched, so an exact or substring match is never taken away
+    claimed = {email for email, _ in matches if email is not None}
+    unclaimed = {}
+    for email in submissions:
+        if email not in claimed:
+            unclaimed.setdefault(email_key(email), email)
+    
+    fuzzy_matched = set()
+    for idx, (first_name, last_name) in enumerate(name_parts):
+        if matches[idx][0] is None and unclaimed:
+            key = find_fuzzy_match(first_name, last_name, unclaimed)
+            if key is not None:
+                email = unclaimed.pop(key)
+                matches[idx] = (email, submissions[email])
+                fuzzy_matched.add(idx)
+    
+    # Grade each student in this period (or mark as no submission)
+    results = []
+    for idx, student_name in enumerate(period_students):
+        matched_email, found_submission = matches[idx]
         
         if found_submission:
-            # Grade the response
-            grades = grade_answer(found_submission, prompts[period]['question'], period)
-            
-            all_grades.append({
-                'Period': period,
-                'Student Name': student_name,
-                'Email': matched_email,
-                'Answer Score': grades['answer_score'],
-                'Cite Score': grades['cite_score'],
-                'Explain Score': grades['explain_score'],
-                'Total Score': grades['total_score'],
-                'Response': found_submission[:100] + '...' if len(found_submission) > 100 else found_submission
-            })
-            
-            print(f"{student_name}: {grades['total_score']}/6 "
-                  f"(A:{grades['answer_score']} C:{grades['cite_score']} E:{grades['explain_score']})")
+            answer_score, cite_score, explain_score, total_score = grade_answer(found_submission, period)
+            preview = found_submission[:100] + '...' if len(found_submission) > 100 else found_submission
+            results.append((student_name, matched_email, answer_score, cite_score, explain_score,
+                            total_score, preview, idx in fuzzy_matched))
         else:
-            # No submission
-            all_grades.append({
-                'Period': period,
-                'Student Name': student_name,
-                'Email': 'Not submitted',
-                'Answer Score': 0,
-                'Cite Score': 0,
-                'Explain Score': 0,
-                'Total Score': 0,
-                'Response': 'NO SUBMISSION'
-            })
-            
-            print(f"{student_name}: 0/6 - NO SUBMISSION")
+            results.append((student_name, None, 0, 0, 0, 0, 'NO SUBMISSION', False))
+    
+    return results
 
 # ============================================================================
-# CREATE EXCEL OUTPUT WITH FORMATTING
+# MAIN GRADING PROCESS
 # ============================================================================
 
-print(f"\n{'=' * 70}")
-print("Creating Excel grade sheet...")
-print("=" * 70)
-
-wb = Workbook()
-ws = wb.active
-ws.title = "Write it Wednesday Grades"
-
-# Headers
-headers = ['Period', 'Student Name', 'Email', 'Answer (0-2)', 'Cite (0-2)', 
-           'Explain (0-2)', 'Total Score (0-6)', 'Response Preview']
-header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-header_font = Font(bold=True, color='FFFFFF', size=11)
-
-for col_idx, header in enumerate(headers, start=1):
-    cell = ws.cell(row=1, column=col_idx)
-    cell.value = header
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.alignment = Alignment(horizontal='center')
-
-# Add data with conditional formatting
-green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')  # 5-6 points
-yellow_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')  # 3-4 points
-red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')     # 0-2 points
-
-for row_idx, grade in enumerate(all_grades, start=2):
-    ws.cell(row=row_idx, column=1, value=grade['Period'])
-    ws.cell(row=row_idx, column=2, value=grade['Student Name'])
-    ws.cell(row=row_idx, column=3, value=grade['Email'])
-    ws.cell(row=row_idx, column=4, value=grade['Answer Score'])
-    ws.cell(row=row_idx, column=5, value=grade['Cite Score'])
-    ws.cell(row=row_idx, column=6, value=grade['Explain Score'])
-    
-    total_cell = ws.cell(row=row_idx, column=7, value=grade['Total Score'])
-    
-    # Color code based on score
-    if grade['Total Score'] >= 5:
-        total_cell.fill = green_fill
-    elif grade['Total Score'] >= 3:
-        total_cell.fill = yellow_fill
-    else:
-        total_cell.fill = red_fill
+def main():
+    # Load master roster to get all students
+    print("Loading master roster...")
+    master_roster = clean_roster(load_roster_cached(master_roster_path, ('Student Name', 'Period')))
     
-    ws.cell(row=row_idx, column=8, value=grade['Response'])
-
-# Adjust column widths
-ws.column_dimensions['A'].width = 8
-ws.column_dimensions['B'].width = 25
-ws.column_dimensions['C'].width = 30
-ws.column_dimensions['D'].width = 12
-ws.column_dimensions['E'].width = 12
-ws.column_dimensions['F'].width = 12
-ws.column_dimensions['G'].width = 15
-ws.column_dimensions['H'].width = 50
-
-# Save
-wb.save(output_path)
+    # Split the roster by period once instead of filtering it for every period
+    students_by_period = {
+        period: group['Student Name'].tolist()
+        for period, group in master_roster.groupby('Period', sort=False)
+    }
+    
+    # Grade the periods in parallel. Each worker gets only its own period's
+    # students, so the whole roster is never copied between processes.
+    max_workers = max(1, min(len(form_files), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(grade_period, file_path, period, students_by_period.get(period, []))
+                   for file_path, period in form_files]
+        period_results = [future.result() for future in futures]
+    
+    # Storage for all grades, one array per column (row i is the i-th student)
+    total_students = sum(len(results) for results in period_results)
+    grade_periods = np.empty(total_students, dtype=np.int8)
+    answer_scores = np.zeros(total_students, dtype=np.int8)
+    cite_scores = np.zeros(total_students, dtype=np.int8)
+    explain_scores = np.zeros(total_students, dtype=np.int8)
+    total_scores = np.zeros(total_students, dtype=np.int8)
+    student_names = []
+    student_emails = []
+    response_previews = []
+    row = 0
+    
+    # Collect and print each period's results in order
+    for (file_path, period), results in zip(form_files, period_results):
+        print(f"\n{'=' * 70}")
+        print(f"Grading Period {period} - {prompts[period]['topic']}")
+        print("=" * 70)
+        
+        for (student_name, matched_email, answer_score, cite_score, explain_score,
+             total_score, preview, fuzzy_matched) in results:
+            grade_periods[row] = period
+            answer_scores[row] = answer_score
+            cite_scores[row] = cite_score
+            explain_scores[row] = explain_score
+            total_scores[row] = total_score
+            student_names.append(student_name)
+            if matched_email is None:
+                student_emails.append('Not submitted')
+            elif fuzzy_matched:
+                # Flag guessed matches so they can be checked in the sheet
+                student_emails.append(f"{matched_email} (fuzzy match - check)")
+            else:
+                student_emails.append(matched_email)
+            response_previews.append(preview)
+            row += 1
+            
+            if matched_email is None:
+                print(f"{student_name}: 0/6 - NO SUBMISSION")
+            else:
+                print(f"{student_name}: {total_score}/6 "
+                      f"(A:{answer_score} C:{cite_score} E:{explain_score})"
+                      + (f" - fuzzy email match: {matched_email}" if fuzzy_matched else ""))
+    
+    # ============================================================================
+    # CREATE EXCEL OUTPUT WITH FORMATTING
+    # ============================================================================
+    
+    print(f"\n{'=' * 70}")
+    print("Creating Excel grade sheet...")
+    print("=" * 70)
+    
+    # Write-only mode streams rows straight to the file instead of keeping
+    # every cell in memory. Column widths must be set before any rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Write it Wednesday Grades")
+    
+    # Adjust column widths
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 25
+    ws.column_dimensions['C'].width = 30
+    ws.column_dimensions['D'].width = 12
+    ws.column_dimensions['E'].width = 12
+    ws.column_dimensions['F'].width = 12
+    ws.column_dimensions['G'].width = 15
+    ws.column_dimensions['H'].width = 50
+    
+    # Headers
+    headers = ['Period', 'Student Name', 'Email', 'Answer (0-2)', 'Cite (0-2)', 
+               'Explain (0-2)', 'Total Score (0-6)', 'Response Preview']
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=11)
+    header_alignment = Alignment(horizontal='center')
+    
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Add data, one appended row per student
+    # (tolist() converts the score arrays to plain ints for openpyxl)
+    for values in zip(grade_periods.tolist(), student_names, student_emails, answer_scores.tolist(),
+                      cite_scores.tolist(), explain_scores.tolist(), total_scores.tolist(),
+                      response_previews):
+        ws.append(values)
+    
+    # Color code the Total Score column with one rule per color band
+    # (rules are checked in order and stop at the first match). An empty
+    # report has no score cells to format.
+    green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')  # 5-6 points
+    yellow_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')  # 3-4 points
+    red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')     # 0-2 points
+    
+    if total_students:
+        total_range = f"G2:G{total_students + 1}"
+        ws.conditional_formatting.add(total_range, CellIsRule(
+            operator='greaterThanOrEqual', formula=['5'], fill=green_fill, stopIfTrue=True))
+        ws.conditional_formatting.add(total_range, CellIsRule(
+            operator='greaterThanOrEqual', formula=['3'], fill=yellow_fill, stopIfTrue=True))
+        ws.conditional_formatting.add(total_range, CellIsRule(
+            operator='lessThan', formula=['3'], fill=red_fill, stopIfTrue=True))
+    
+    # Save
+    wb.save(output_path)
+    
+    # ============================================================================
+    # PRINT SUMMARY STATISTICS
+    # ============================================================================
+    
+    print(f"\n{'=' * 70}")
+    print("GRADING SUMMARY")
+    print("=" * 70)
+    
+    for period in np.unique(grade_periods):
+        period_totals = total_scores[grade_periods == period]
+        avg_score = period_totals.mean()
+        submitted = np.count_nonzero(period_totals)
+        total = len(period_totals)
+        print(f"\nPeriod {period}:")
+        print(f"  Students: {total}")
+        print(f"  Submitted: {submitted} ({submitted/total*100:.1f}%)")
+        print(f"  Average Score: {avg_score:.2f}/6")
+    
+    # Guard against an empty report (no form files or no students)
+    total_submitted = np.count_nonzero(total_scores)
+    submitted_percent = total_submitted / total_students * 100 if total_students else 0.0
+    total_avg = total_scores.mean() if total_students else 0.0
+    
+    print(f"\n{'=' * 70}")
+    print(f"Overall:")
+    print(f"  Total Students: {total_students}")
+    print(f"  Submitted: {total_submitted} ({submitted_percent:.1f}%)")
+    print(f"  Average Score: {total_avg:.2f}/6")
+    print(f"\n{'=' * 70}")
+    print(f"Grades saved to: {output_path}")
+    print("=" * 70)
+    print("\nNext steps:")
+    print("  1. Open the Excel file to review scores")
+    print("  2. Spot-check responses, especially borderline scores (3-4)")
+    print("  3. Make manual adjustments as needed")
+    print("  4. Transfer scores to your gradebook")
+    print("=" * 70)
 
 # ============================================================================
-# PRINT SUMMARY STATISTICS
+# ENTRY POINT
 # ============================================================================
 
-print(f"\n{'=' * 70}")
-print("GRADING SUMMARY")
-print("=" * 70)
-
-for period in sorted(set(g['Period'] for g in all_grades)):
-    period_grades = [g for g in all_grades if g['Period'] == period]
-    avg_score = sum(g['Total Score'] for g in period_grades) / len(period_grades)
-    submitted = sum(1 for g in period_grades if g['Total Score'] > 0)
-    total = len(period_grades)
-    print(f"\nPeriod {period}:")
-    print(f"  Students: {total}")
-    print(f"  Submitted: {submitted} ({submitted/total*100:.1f}%)")
-    print(f"  Average Score: {avg_score:.2f}/6")
-
-total_students = len(all_grades)
-total_submitted = sum(1 for g in all_grades if g['Total Score'] > 0)
-total_avg = sum(g['Total Score'] for g in all_grades) / len(all_grades)
-
-print(f"\n{'=' * 70}")
-print(f"Overall:")
-print(f"  Total Students: {total_students}")
-print(f"  Submitted: {total_submitted} ({total_submitted/total_students*100:.1f}%)")
-print(f"  Average Score: {total_avg:.2f}/6")
-print(f"\n{'=' * 70}")
-print(f"Grades saved to: {output_path}")
-print("=" * 70)
-print("\nNext steps:")
-print("  1. Open the Excel file to review scores")
-print("  2. Spot-check responses, especially borderline scores (3-4)")
-print("  3. Make manual adjustments as needed")
-print("  4. Transfer scores to your gradebook")
-print("=" * 70)
+if __name__ == "__main__":
+    main()
@@ -19,11 +19,14 @@ VERSION: 2.0 (Interactive)
 
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-import csv
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
 from pathlib import Path
+from roster_utils import load_roster_cached, clean_roster, split_student_name, match_submissions
 
 # ============================================================================
 # HELP DOCUMENTATION
@@ -193,6 +196,55 @@ def get_yes_no(prompt, default='y'):
 # GRADING FUNCTION
 # ============================================================================
 
+# Standard citation phrases for the CITE component
+CITE_PHRASES = (
+    'author states', 'article states', 'passage', 'according to',
+    'text states', 'paragraph', 'excerpt', 'states that', 'mentions',
+    'the text', 'the article', 'the passage'
+)
+
+# Quotation marks for the CITE component: straight and curly double quotes
+QUOTE_MARKS = ('"', '\u201c', '\u201d')
+
+# Standard explanation/connection words for the EXPLAIN component
+EXPLAIN_PHRASES = (
+    'this shows', 'this proves', 'this means', 'therefore',
+    'because', 'which causes', 'as a result', 'this demonstrates',
+    'this explains', 'validates', 'supports', 'connected', 'since',
+    'thus', 'hence', 'consequently'
+)
+
+def count_sentences(text):
+    """
+    Count substantial and incomplete sentences in a single pass.
+    
+    Sentences are the pieces of text between periods. A piece longer than
+    10 characters (ignoring surrounding whitespace) is substantial; a
+    non-empty piece shorter than 10 characters is incomplete.
+    
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        tuple: (sentence_count, incomplete_count)
+    """
+    sentence_count = 0
+    incomplete_count = 0
+    start = 0
+    while True:
+        # Walk from one period to the next instead of splitting the text
+        # into a list; the last piece runs to the end of the text
+        end = text.find('.', start)
+        piece = text[start:] if end == -1 else text[start:end]
+        length = len(piece.strip())
+        if length > 10:
+            sentence_count += 1
+        elif 0 < length < 10:
+            incomplete_count += 1
+        if end == -1:
+            return sentence_count, incomplete_count
+        start = end + 1
+
 def grade_answer(response, period, keywords_answer, keywords_cite, keywords_explain):
     """
     Grade a student response based on ACE rubric.
@@ -200,7 +252,7 @@ def grade_answer(response, period, keywords_answer, keywords_cite, keywords_expl
     Args:
         response: Student's written response
         period: Class period number
-        keywords_answer: Keywords that indicate a complete answer
+        keywords_answer: Keywords that indicate a complete answer (lowercase)
         keywords_cite: Citation phrases to look for
         keywords_explain: Explanation/connection words to look for
     
@@ -210,7 +262,7 @@ def grade_answer(response, period, keywords_answer, keywords_cite, keywords_expl
     response_lower = response.lower()
     
     # ANSWER SCORING (0-2)
-    keyword_count = sum(1 for keyword in keywords_answer if keyword.lower() in response_lower)
+    keyword_count = sum(1 for keyword in keywords_answer if keyword in response_lower)
     
     if keyword_count >= len(keywords_answer) * 0.8:  # 80% of keywords present
         answer_score = 2
@@ -220,12 +272,12 @@ def grade_answer(response, period, keywords_answer, keywords_cite, keywords_expl
         answer_score = 0
     
     # CITE SCORING (0-2)
-    has_quotes = '"' in response or '"' in response or '"' in response
-    has_cite_language = any(phrase in response_lower for phrase in keywords_cite)
+    # Quotes or citation language each earn full credit, so the phrase
+    # scan is skipped when the response already quotes the text
+    has_citation = (any(mark in response for mark in QUOTE_MARKS)
+                    or any(phrase in response_lower for phrase in keywords_cite))
     
-    if has_quotes and has_cite_language:
-        cite_score = 2
-    elif has_quotes or has_cite_language:
+    if has_citation:
         cite_score = 2  # Either method shows citation
     elif len(response) > 100:
         cite_score = 1
@@ -234,8 +286,8 @@ def grade_answer(response, period, keywords_answer, keywords_cite, keywords_expl
     
     # EXPLAIN SCORING (0-2)
     has_explanation = any(phrase in response_lower for phrase in keywords_explain)
-    sentences = [s for s in response.split('.') if len(s.strip()) > 10]
-    has_structure = len(sentences) >= 3
+    sentence_count, _ = count_sentences(response)
+    has_structure = sentence_count >= 3
     
     if has_explanation and has_structure:
         explain_score = 2
@@ -258,6 +310,66 @@ def grade_answer(response, period, keywords_answer, keywords_cite, keywords_expl
         'total_score': total_score
     }
 
+# ============================================================================
+# PER-PERIOD GRADING
+# ============================================================================
+
+def grade_period(file_path, period, period_students, keywords_answer, keywords_cite, keywords_explain):
+    """
+    Match and grade one period's Google Form submissions.
+    
+    Periods share no data, so each one is graded in its own worker process.
+    Nothing is printed here; main() prints progress in period order.
+    
+    Args:
+        file_path: Path to this period's Google Form CSV
+        period: Class period number
+        period_students: List of (student name, first name, last name) for this period
+        keywords_answer: Keywords that indicate a complete answer (lowercase)
+        keywords_cite: Citation phrases to look for
+        keywords_explain: Explanation/connection words to look for
+    
+    Returns:
+        tuple: (number of submissions in the CSV, list of grade rows in roster order)
+    """
+    # Read form responses (only the Username and answer columns)
+    # Blank answers stay as empty strings so they count as no submission
+    responses = pd.read_csv(file_path, usecols=[1, 2], dtype=str, keep_default_na=False)
+    
+    # Create dictionary of submissions
+    emails = responses['Username'].str.strip().str.lower()
+    answers = responses.iloc[:, 1]  # Third column is the answer
+    submissions = dict(zip(emails, answers))
+    
+    # Find matching submissions (emails are already lowercase); each email
+    # is claimed by at most one student
+    matches = match_submissions([(first_name, last_name)
+                                 for _, first_name, last_name in period_students],
+                                submissions)
+    
+    # Grade each student
+    rows = []
+    for (student_name, _, _), (matched_email, found_submission) in zip(period_students, matches):
+        if found_submission:
+            # Grade the response
+            grades = grade_answer(
+                found_submission,
+                period,
+                keywords_answer,
+                keywords_cite,
+                keywords_explain
+            )
+            
+            rows.append((period, student_name, matched_email,
+                         grades['answer_score'], grades['cite_score'],
+                         grades['explain_score'], grades['total_score'],
+                         found_submission[:100] + '...' if len(found_submission) > 100 else found_submission))
+        else:
+            # No submission
+            rows.append((period, student_name, 'Not submitted', 0, 0, 0, 0, 'NO SUBMISSION'))
+    
+    return len(submissions), rows
+
 # ============================================================================
 # MAIN INTERACTIVE SCRIPT
 # ============================================================================
@@ -268,7 +380,8 @@ def main():
     # Check for help flag
     if '--help' in sys.argv or '-h' in sys.argv:
         print(HELP_TEXT)
-        input()  # Wait for user to read
+        if sys.stdin.isatty():  # Only wait when someone is at the keyboard
+            input()
         return
     
     print_header()
@@ -278,7 +391,8 @@ def main():
     
     if get_yes_no("Would you like to see detailed help before starting?", default='n'):
         print(HELP_TEXT)
-        input("Press Enter to continue...")
+        if sys.stdin.isatty():
+            input("Press Enter to continue...")
     
     # ========================================================================
     # STEP 1: Get Master Roster
@@ -296,8 +410,9 @@ def main():
     
     # Load and validate master roster
     try:
-        master_roster = pd.read_excel(master_roster_path)
+        # Only the name and period columns are used
         required_cols = ['Student Name', 'Period']
+        master_roster = load_roster_cached(master_roster_path, tuple(required_cols))
         missing_cols = [col for col in required_cols if col not in master_roster.columns]
         
         if missing_cols:
@@ -305,7 +420,10 @@ def main():
             print(f"  Please make sure your roster has: Student Name, Period")
             return
         
-        periods_available = sorted(master_roster['Period'].unique())
+        # Skip blank or totals rows; names are str and periods int from here on
+        master_roster = clean_roster(master_roster)
+        
+        periods_available = np.sort(master_roster['Period'].unique()).tolist()
         print(f"\n  ✓ Master roster loaded successfully!")
         print(f"  ✓ Found {len(master_roster)} students across periods: {periods_available}")
         
@@ -323,15 +441,19 @@ def main():
     
     form_files = []
     
+    # List the current folder once to offer default response file paths,
+    # instead of checking for each period's default file separately
+    cwd_files = {entry.name for entry in os.scandir('.') if entry.is_file()}
+    
     for period in periods_available:
         print(f"\nPeriod {period}:")
         has_file = get_yes_no(f"  Do you have responses for Period {period}?", default='y')
         
         if has_file:
-            default_name = f"./Week_1_Period_{period}_Responses.csv"
+            default_name = f"Week_1_Period_{period}_Responses.csv"
             file_path = get_file_path(
                 f"  Enter path to Period {period} responses CSV",
-                default=default_name if os.path.exists(default_name) else None
+                default=f"./{default_name}" if default_name in cwd_files else None
             )
             form_files.append((file_path, period))
         else:
@@ -355,23 +477,13 @@ def main():
     print("Example: magma, lava, pressure, gases\n")
     
     answer_keywords = input("  Answer keywords: ").strip()
-    keywords_answer = [k.strip() for k in answer_keywords.split(',')]
+    keywords_answer = [k.strip().lower() for k in answer_keywords.split(',')]
     
     print("\n  ✓ Will check for answer keywords:", keywords_answer)
     
     # Use standard citation and explanation keywords
-    keywords_cite = [
-        'author states', 'article states', 'passage', 'according to',
-        'text states', 'paragraph', 'excerpt', 'states that', 'mentions',
-        'the text', 'the article', 'the passage'
-    ]
-    
-    keywords_explain = [
-        'this shows', 'this proves', 'this means', 'therefore',
-        'because', 'which causes', 'as a result', 'this demonstrates',
-        'this explains', 'validates', 'supports', 'connected', 'since',
-        'thus', 'hence', 'consequently'
-    ]
+    keywords_cite = CITE_PHRASES
+    keywords_explain = EXPLAIN_PHRASES
     
     print("  ✓ Using standard CITE keywords (quotes, 'according to', etc.)")
     print("  ✓ Using standard EXPLAIN keywords (because, this shows, etc.)")
@@ -417,93 +529,45 @@ def main():
     
     print_section("Grading in Progress")
     
-    all_grades = []
+    # Storage for all grades, one list per column (row i is the i-th student)
+    grade_columns = {column: [] for column in (
+        'Period', 'Student Name', 'Email', 'Answer Score',
+        'Cite Score', 'Explain Score', 'Total Score', 'Response')}
+    
+    # Split the roster by period once instead of filtering it for every
+    # period, normalizing each name for email matching at the same time
+    students_by_period = {
+        period: [(student_name, *split_student_name(student_name))
+                 for student_name in group['Student Name']]
+        for period, group in master_roster.groupby('Period', sort=False)
+    }
     
-    for file_path, period in form_files:
-        print(f"\nProcessing Period {period}...")
+    # Grade the periods in parallel worker processes. Each worker gets only
+    # its own period's students; results are collected in period order.
+    max_workers = max(1, min(len(form_files), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(grade_period, file_path, period, students_by_period.get(period, []),
+                            keywords_answer, keywords_cite, keywords_explain)
+            for file_path, period in form_files
+        ]
         
-        try:
-            # Read form responses
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
-                responses = list(reader)
+        for (file_path, period), future in zip(form_files, futures):
+            print(f"\nProcessing Period {period}...")
             
-            # Create dictionary of submissions
-            submissions = {}
-            for response in responses:
-                email = response['Username'].strip().lower()
-                answer_text = response[list(response.keys())[2]]  # Third column
-                submissions[email] = answer_text
+            try:
+                submission_count, rows = future.result()
+            except Exception as e:
+                print(f"  ⚠ ERROR processing Period {period}: {e}")
+                continue
             
-            print(f"  Found {len(submissions)} submission(s)")
+            print(f"  Found {submission_count} submission(s)")
             
-            # Get students for this period
-            period_students = master_roster[master_roster['Period'] == period]
+            for row in rows:
+                for values, value in zip(grade_columns.values(), row):
+                    values.append(value)
             
-            # Grade each student
-            for _, student in period_students.iterrows():
-                student_name = student['Student Name']
-                
-                # Match email to student
-                if ',' in student_name:
-                    last_name, first_name = student_name.split(',', 1)
-                    last_name = last_name.strip().lower().replace(' ', '').replace('-', '')
-                    first_name = first_name.strip().lower().replace(' ', '').replace('-', '')
-                else:
-                    parts = student_name.split()
-                    first_name = parts[0].lower() if parts else ""
-                    last_name = ' '.join(parts[1:]).lower().replace(' ', '').replace('-', '') if len(parts) > 1 else ""
-                
-                # Find matching submission
-                found_submission = None
-                matched_email = None
-                
-                for email, answer_text in submissions.items():
-                    # Remove hyphens from email for comparison to match cleaned names
-                    email_clean = email.lower().replace('-', '')
-                    if first_name in email_clean and last_name in email_clean:
-                        found_submission = answer_text
-                        matched_email = email
-                        break
-                
-                if found_submission:
-                    # Grade the response
-                    grades = grade_answer(
-                        found_submission,
-                        period,
-                        keywords_answer,
-                        keywords_cite,
-                        keywords_explain
-                    )
-                    
-                    all_grades.append({
-                        'Period': period,
-                        'Student Name': student_name,
-                        'Email': matched_email,
-                        'Answer Score': grades['answer_score'],
-                        'Cite Score': grades['cite_score'],
-                        'Explain Score': grades['explain_score'],
-                        'Total Score': grades['total_score'],
-                        'Response': found_submission[:100] + '...' if len(found_submission) > 100 else found_submission
-                    })
-                else:
-                    # No submission
-                    all_grades.append({
-                        'Period': period,
-                        'Student Name': student_name,
-                        'Email': 'Not submitted',
-                        'Answer Score': 0,
-                        'Cite Score': 0,
-                        'Explain Score': 0,
-                        'Total Score': 0,
-                        'Response': 'NO SUBMISSION'
-                    })
-            
-            print(f"  ✓ Graded {len(period_students)} student(s)")
-            
-        except Exception as e:
-            print(f"  ⚠ ERROR processing Period {period}: {e}")
-            continue
+            print(f"  ✓ Graded {len(rows)} student(s)")
     
     # ========================================================================
     # CREATE EXCEL OUTPUT
@@ -511,57 +575,61 @@ def main():
     
     print("\nCreating Excel grade sheet...")
     
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Grades"
+    # Write-only mode streams rows straight to the file instead of keeping
+    # every cell in memory. Column widths must be set before any rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Grades")
+    
+    # Adjust column widths
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 25
+    ws.column_dimensions['C'].width = 30
+    ws.column_dimensions['D'].width = 12
+    ws.column_dimensions['E'].width = 12
+    ws.column_dimensions['F'].width = 12
+    ws.column_dimensions['G'].width = 15
+    ws.column_dimensions['H'].width = 50
     
     # Headers
     headers = ['Period', 'Student Name', 'Email', 'Answer (0-2)', 'Cite (0-2)',
                'Explain (0-2)', 'Total Score (0-6)', 'Response Preview']
     header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
     header_font = Font(bold=True, color='FFFFFF', size=11)
+    header_alignment = Alignment(horizontal='center')
     
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = header
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.fill = header_fill
         cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
     
     # Add data with color coding
+    # Total score colors are registered once as named styles; each cell
+    # then just refers to a style by name
     green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
     yellow_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
     red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    wb.add_named_style(NamedStyle(name='green_total', fill=green_fill))
+    wb.add_named_style(NamedStyle(name='yellow_total', fill=yellow_fill))
+    wb.add_named_style(NamedStyle(name='red_total', fill=red_fill))
     
-    for row_idx, grade in enumerate(all_grades, start=2):
-        ws.cell(row=row_idx, column=1, value=grade['Period'])
-        ws.cell(row=row_idx, column=2, value=grade['Student Name'])
-        ws.cell(row=row_idx, column=3, value=grade['Email'])
-        ws.cell(row=row_idx, column=4, value=grade['Answer Score'])
-        ws.cell(row=row_idx, column=5, value=grade['Cite Score'])
-        ws.cell(row=row_idx, column=6, value=grade['Explain Score'])
-        
-        total_cell = ws.cell(row=row_idx, column=7, value=grade['Total Score'])
+    for (period, student_name, email, answer_score, cite_score, explain_score,
+         total_score, response) in zip(*grade_columns.values()):
+        total_cell = WriteOnlyCell(ws, value=total_score)
         
         # Color code
-        if grade['Total Score'] >= 5:
-            total_cell.fill = green_fill
-        elif grade['Total Score'] >= 3:
-            total_cell.fill = yellow_fill
+        if total_score >= 5:
+            total_cell.style = 'green_total'
+        elif total_score >= 3:
+            total_cell.style = 'yellow_total'
         else:
-            total_cell.fill = red_fill
+            total_cell.style = 'red_total'
         
-        ws.cell(row=row_idx, column=8, value=grade['Response'])
-    
-    # Adjust column widths
-    ws.column_dimensions['A'].width = 8
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 30
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 12
-    ws.column_dimensions['F'].width = 12
-    ws.column_dimensions['G'].width = 15
-    ws.column_dimensions['H'].width = 50
+        ws.append([period, student_name, email, answer_score, cite_score,
+                   explain_score, total_cell, response])
     
     # Save
     wb.save(output_path)
@@ -572,9 +640,12 @@ def main():
     
     print_section("Grading Complete!")
     
-    total_students = len(all_grades)
-    total_submitted = sum(1 for g in all_grades if g['Total Score'] > 0)
-    total_avg = sum(g['Total Score'] for g in all_grades) / total_students if total_students > 0 else 0
+    periods = np.asarray(grade_columns['Period'])
+    totals = np.asarray(grade_columns['Total Score'])
+    
+    total_students = len(totals)
+    total_submitted = np.count_nonzero(totals)
+    total_avg = totals.mean() if total_students > 0 else 0
     
     print(f"\n📊 Overall Results:")
     print(f"  • Total students: {total_students}")
@@ -582,11 +653,11 @@ def main():
     print(f"  • Average score: {total_avg:.2f}/6")
     
     print(f"\n📊 By Period:")
-    for period in sorted(set(g['Period'] for g in all_grades)):
-        period_grades = [g for g in all_grades if g['Period'] == period]
-        avg = sum(g['Total Score'] for g in period_grades) / len(period_grades)
-        submitted = sum(1 for g in period_grades if g['Total Score'] > 0)
-        print(f"  Period {period}: {submitted}/{len(period_grades)} submitted, avg {avg:.2f}/6")
+    for period in np.unique(periods):
+        period_totals = totals[periods == period]
+        avg = period_totals.mean()
+        submitted = np.count_nonzero(period_totals)
+        print(f"  Period {period}: {submitted}/{len(period_totals)} submitted, avg {avg:.2f}/6")
     
     print(f"\n💾 Grades saved to:")
     print(f"  {output_path}")
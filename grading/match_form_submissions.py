@@ -1,160 +1,188 @@
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from openpyxl import load_workbook, Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-
-# Load the master roster
-master_roster = pd.read_excel('/mnt/user-data/outputs/Master_Class_Roster_Spring_2026.xlsx')
-
-# Define the Google Form files and their periods
-form_files = [
-    ('/mnt/user-data/uploads/Week_1_Period_1_Writing_Project___How_Volcanoes_Erupt_.csv', 1),
-    ('/mnt/user-data/uploads/Week_1_Period_3_Writing_Project___All_About_Mammals__.csv', 3),
-    ('/mnt/user-data/uploads/Week_1_Period_4_Writing_Project___What_is_Gravity___.csv', 4),
-    ('/mnt/user-data/uploads/Week_1_Period_5_Writing_Project___Why_We_Have_Rules_and_Laws__.csv', 5)
-]
-
-# Dictionary to store who completed by period
-completed_by_period = {}
-
-# Process each Google Form file
-for file_path, period in form_files:
-    print(f"\nProcessing Period {period} submissions...")
-    
-    # Read the form responses
-    form_df = pd.read_csv(file_path)
-    
-    # Extract usernames (email addresses)
-    if 'Username' in form_df.columns:
-        submitted_emails = set(form_df['Username'].str.lower().str.strip())
-        completed_by_period[period] = submitted_emails
-        print(f"  Found {len(submitted_emails)} submissions")
-    else:
-        print(f"  ERROR: No 'Username' column found in {file_path}")
-        completed_by_period[period] = set()
-
-# Create a completion report
-print("\n" + "="*60)
-print("Creating completion report...")
-print("="*60)
-
-# Prepare data for the report
-report_data = []
-
-for _, student in master_roster.iterrows():
-    period = student['Period']
-    student_name = student['Student Name']
-    grade = student['Grade']
-    student_id = student['Student ID']
-    course = student['Course']
-    
-    # Try to match student to email
-    # Extract first and last name
-    if ',' in student_name:
-        last_name, first_name = student_name.split(',', 1)
-        last_name = last_name.strip()
-        first_name = first_name.strip()
-    else:
-        # Handle names without comma
-        parts = student_name.split()
-        if len(parts) >= 2:
-            first_name = parts[0]
-            last_name = ' '.join(parts[1:])
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from roster_utils import (load_roster_cached, clean_roster, read_form_usernames,
+                          split_student_name, email_key)
+
+def create_completion_report(master_roster, form_files, output_path):
+    """
+    Check who submitted one week's Google Forms and save the completion report.
+    
+    Args:
+        master_roster (DataFrame): The master roster, with the normalized
+                                   name parts in '_first' and '_last'
+        form_files (list): (CSV path, period) for each of the week's forms
+        output_path (str): Where to save the week's report
+    """
+    # Dictionary to store who completed by period. Names only ever appear
+    # before the @, so each email is normalized and reduced to its username
+    # once, here, instead of on every comparison.
+    completed_by_period = {}
+    
+    # Start reading all of the week's forms at once. pandas' C parser
+    # releases the GIL, so on a small thread pool the files' reads overlap
+    # while earlier ones are being processed below.
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(form_files)))) as executor:
+        form_reads = [executor.submit(read_form_usernames, file_path)
+                      for file_path, period in form_files]
+    
+        # Process each Google Form file, in order
+        for (file_path, period), form_read in zip(form_files, form_reads):
+            print(f"\nProcessing Period {period} submissions...")
+    
+            form_df = form_read.result()
+    
+            # Extract usernames (email addresses)
+            if 'Username' in form_df.columns:
+                submitted_emails = set(form_df['Username'].str.lower().str.strip())
+                completed_by_period[period] = [email.split('@', 1)[0] for email in submitted_emails]
+                print(f"  Found {len(submitted_emails)} submissions")
+            else:
+                print(f"  ERROR: No 'Username' column found in {file_path}")
+                completed_by_period[period] = []
+    
+    # Index each period's usernames once so students whose email follows
+    # firstname.lastname### or lastname.firstname### are found with a
+    # single set lookup
+    email_keys_by_period = {
+        period: {email_key(username) for username in usernames}
+        for period, usernames in completed_by_period.items()
+    }
+    
+    # Create a completion report
+    print("\n" + "="*60)
+    print("Creating completion report...")
+    print("="*60)
+    
+    # Completion status for each roster row, in roster order
+    completions = []
+    
+    # Walk the roster columns directly (iterrows() would build a Series per student)
+    for period, first_lower, last_lower in zip(
+            master_roster['Period'], master_roster['_first'], master_roster['_last']):
+        # Check if this student's period had submissions
+        usernames = completed_by_period.get(period)
+        if usernames is None:
+            completed = "No Form"
+        elif not usernames:
+            # The form came back empty, so there is nothing to match against
+            completed = "No"
         else:
-            first_name = student_name
-            last_name = ""
-    
-    # Check if this student's period had submissions
-    if period in completed_by_period:
-        submitted_emails = completed_by_period[period]
-        
-        # Try to find a matching email
-        # Common pattern: firstname.lastname###@uisd.net
-        found_match = False
-        
-        for email in submitted_emails:
-            # Check if email contains the student's name parts
-            email_lower = email.lower()
-            first_lower = first_name.lower().replace(' ', '').replace('-', '')
-            last_lower = last_name.lower().replace(' ', '').replace('-', '')
-            
-            # Try various matching patterns
-            if first_lower in email_lower and last_lower in email_lower:
-                found_match = True
-                break
-        
-        completed = "Yes" if found_match else "No"
-    else:
-        completed = "No Form"
-    
-    report_data.append({
-        'Student Name': student_name,
-        'Grade': grade,
-        'Student ID': student_id,
-        'Period': period,
-        'Course': course,
-        'Write it Wednesday': completed
-    })
-
-# Create Excel workbook for report
-wb = Workbook()
-ws = wb.active
-ws.title = "Write it Wednesday Report"
-
-# Add headers with styling
-headers = ['Student Name', 'Grade', 'Student ID', 'Period', 'Course', 'Write it Wednesday']
-header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-header_font = Font(bold=True, color='FFFFFF')
-
-for col_idx, header in enumerate(headers, start=1):
-    cell = ws.cell(row=1, column=col_idx)
-    cell.value = header
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.alignment = Alignment(horizontal='center')
-
-# Add data with conditional formatting
-yes_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-no_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-
-for row_idx, student in enumerate(report_data, start=2):
-    ws.cell(row=row_idx, column=1, value=student['Student Name'])
-    ws.cell(row=row_idx, column=2, value=student['Grade'])
-    ws.cell(row=row_idx, column=3, value=student['Student ID'])
-    ws.cell(row=row_idx, column=4, value=student['Period'])
-    ws.cell(row=row_idx, column=5, value=student['Course'])
-    
-    completion_cell = ws.cell(row=row_idx, column=6, value=student['Write it Wednesday'])
-    
-    # Color code the completion status
-    if student['Write it Wednesday'] == 'Yes':
-        completion_cell.fill = yes_fill
-    elif student['Write it Wednesday'] == 'No':
-        completion_cell.fill = no_fill
-
-# Adjust column widths
-ws.column_dimensions['A'].width = 30
-ws.column_dimensions['B'].width = 8
-ws.column_dimensions['C'].width = 12
-ws.column_dimensions['D'].width = 8
-ws.column_dimensions['E'].width = 12
-ws.column_dimensions['F'].width = 20
-
-# Save the workbook
-output_path = '/mnt/user-data/outputs/Write_it_Wednesday_Week_1_Report.xlsx'
-wb.save(output_path)
-
-# Print summary statistics
-print("\nCompletion Summary by Period:")
-for period in sorted(completed_by_period.keys()):
-    period_students = [s for s in report_data if s['Period'] == period]
-    completed = len([s for s in period_students if s['Write it Wednesday'] == 'Yes'])
-    total = len(period_students)
-    percentage = (completed / total * 100) if total > 0 else 0
-    print(f"  Period {period}: {completed}/{total} ({percentage:.1f}%)")
-
-total_students = len(report_data)
-total_completed = len([s for s in report_data if s['Write it Wednesday'] == 'Yes'])
-total_percentage = (total_completed / total_students * 100) if total_students > 0 else 0
-print(f"\nOverall: {total_completed}/{total_students} ({total_percentage:.1f}%)")
+            # Try to find a matching email
+            # Common pattern: firstname.lastname###@uisd.net
+            email_keys = email_keys_by_period[period]
+            found_match = (email_key(first_lower + last_lower) in email_keys
+                           or email_key(last_lower + first_lower) in email_keys)
+    
+            # Otherwise check if any email contains the student's name parts
+            # (emails are already lowercased)
+            if not found_match:
+                found_match = any(first_lower in username and last_lower in username
+                                  for username in usernames)
+    
+            completed = "Yes" if found_match else "No"
+    
+        completions.append(completed)
+    
+    # Keep the report as one table; the workbook and the summary both read
+    # straight from its columns
+    headers = ['Student Name', 'Grade', 'Student ID', 'Period', 'Course', 'Write it Wednesday']
+    report_df = master_roster[headers[:-1]].assign(**{'Write it Wednesday': completions})
+    
+    # Create Excel workbook for report
+    # Write-only mode streams rows straight to the file instead of keeping
+    # every cell in memory. Column widths must be set before any rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Write it Wednesday Report")
+    
+    # Adjust column widths
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 8
+    ws.column_dimensions['C'].width = 12
+    ws.column_dimensions['D'].width = 8
+    ws.column_dimensions['E'].width = 12
+    ws.column_dimensions['F'].width = 20
+    
+    # Add headers with styling
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF')
+    header_alignment = Alignment(horizontal='center')
+    
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Add data with conditional formatting
+    # The status colors are registered once as named styles; each cell
+    # then just refers to a style by name
+    yes_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+    no_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    wb.add_named_style(NamedStyle(name='completed', fill=yes_fill))
+    wb.add_named_style(NamedStyle(name='not_completed', fill=no_fill))
+    
+    for *student, completed in report_df.itertuples(index=False, name=None):
+        completion_cell = WriteOnlyCell(ws, value=completed)
+    
+        # Color code the completion status
+        if completed == 'Yes':
+            completion_cell.style = 'completed'
+        elif completed == 'No':
+            completion_cell.style = 'not_completed'
+    
+        ws.append(student + [completion_cell])
+    
+    # Save the workbook
+    wb.save(output_path)
+    
+    # Count students and completions per period in one groupby
+    is_completed = report_df['Write it Wednesday'] == 'Yes'
+    by_period = is_completed.groupby(report_df['Period']).agg(['sum', 'size'])
+    
+    # Print summary statistics (periods without a roster student show 0/0)
+    print("\nCompletion Summary by Period:")
+    by_period = by_period.reindex(sorted(completed_by_period), fill_value=0)
+    for period, completed, total in by_period.itertuples(name=None):
+        percentage = (completed / total * 100) if total > 0 else 0
+        print(f"  Period {period}: {completed}/{total} ({percentage:.1f}%)")
+    
+    total_students = len(report_df)
+    total_completed = int(is_completed.sum())
+    total_percentage = (total_completed / total_students * 100) if total_students > 0 else 0
+    print(f"\nOverall: {total_completed}/{total_students} ({total_percentage:.1f}%)")
+    
+    print(f"\nReport saved to: {output_path}")
+
+# Load the master roster once, however many weeks are processed
+master_roster = load_roster_cached('/mnt/user-data/outputs/Master_Class_Roster_Spring_2026.xlsx',
+                                   ('Student Name', 'Period', 'Grade', 'Student ID', 'Course'))
+# Skip blank or totals rows (no name or period) before anything uses them
+master_roster = clean_roster(master_roster)
+
+# Split every student's name once; each week's report reuses the parts
+name_parts = [split_student_name(student_name) for student_name in master_roster['Student Name']]
+master_roster['_first'] = [first for first, last in name_parts]
+master_roster['_last'] = [last for first, last in name_parts]
+
+# Define each week's Google Form files (with their periods) and report path.
+# List several weeks to build all of their reports in one run.
+weeks = [
+    {
+        'form_files': [
+            ('/mnt/user-data/uploads/Week_1_Period_1_Writing_Project___How_Volcanoes_Erupt_.csv', 1),
+            ('/mnt/user-data/uploads/Week_1_Period_3_Writing_Project___All_About_Mammals__.csv', 3),
+            ('/mnt/user-data/uploads/Week_1_Period_4_Writing_Project___What_is_Gravity___.csv', 4),
+            ('/mnt/user-data/uploads/Week_1_Period_5_Writing_Project___Why_We_Have_Rules_and_Laws__.csv', 5)
+        ],
+        'output_path': '/mnt/user-data/outputs/Write_it_Wednesday_Week_1_Report.xlsx',
+    },
+]
 
-print(f"\nReport saved to: {output_path}")
+for week in weeks:
+    create_completion_report(master_roster, week['form_files'], week['output_path'])
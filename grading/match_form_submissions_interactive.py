@@ -19,9 +19,14 @@ VERSION: 2.0 (Interactive)
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from roster_utils import (load_roster_cached, clean_roster, read_form_usernames,
+                          split_student_name, email_key, NON_LETTERS)
 
 # ============================================================================
 # HELP DOCUMENTATION
@@ -170,6 +175,33 @@ def get_yes_no(prompt, default='y'):
     
     return response in ['y', 'yes']
 
+# ============================================================================
+# EMAIL MATCHING
+# ============================================================================
+
+def has_submission(first_name, last_name, email_keys, email_usernames):
+    """
+    Check whether any submitted email belongs to a student.
+    
+    Emails following a firstname.lastname### or lastname.firstname###
+    pattern are found with a single set lookup. Anything else falls back
+    to checking every email's username for both name parts.
+    
+    Args:
+        first_name: Normalized (lowercase) first name
+        last_name: Normalized (lowercase) last name
+        email_keys: Set of email_key() values for the period's emails
+        email_usernames: The period's lowercased emails without the @domain
+    
+    Returns:
+        bool: True if the student submitted
+    """
+    if (NON_LETTERS.sub('', first_name + last_name) in email_keys
+            or NON_LETTERS.sub('', last_name + first_name) in email_keys):
+        return True
+    
+    return any(first_name in username and last_name in username for username in email_usernames)
+
 # ============================================================================
 # MAIN INTERACTIVE SCRIPT
 # ============================================================================
@@ -180,7 +212,8 @@ def main():
     # Check for help
     if '--help' in sys.argv or '-h' in sys.argv:
         print(HELP_TEXT)
-        input()
+        if sys.stdin.isatty():  # Only wait when someone is at the keyboard
+            input()
         return
     
     print_header()
@@ -190,7 +223,8 @@ def main():
     
     if get_yes_no("Would you like to see detailed help before starting?", default='n'):
         print(HELP_TEXT)
-        input("Press Enter to continue...")
+        if sys.stdin.isatty():
+            input("Press Enter to continue...")
     
     # ========================================================================
     # STEP 1: Get Master Roster
@@ -207,13 +241,17 @@ def main():
     
     # Load and validate
     try:
-        master_roster = pd.read_excel(master_roster_path)
+        # Course is optional; the other roster columns aren't used here
+        master_roster = load_roster_cached(master_roster_path, ('Student Name', 'Period', 'Course'))
         
         if 'Student Name' not in master_roster.columns or 'Period' not in master_roster.columns:
             print("\n  ⚠ ERROR: Master roster must have 'Student Name' and 'Period' columns")
             return
         
-        periods_available = sorted(master_roster['Period'].unique())
+        # Skip blank or totals rows; names are str and periods int from here on
+        master_roster = clean_roster(master_roster)
+        
+        periods_available = np.sort(master_roster['Period'].unique()).tolist()
         print(f"\n  ✓ Master roster loaded successfully!")
         print(f"  ✓ Found {len(master_roster)} students across periods: {periods_available}")
         
@@ -230,15 +268,19 @@ def main():
     
     form_files = []
     
+    # List the current folder once to offer default response file paths,
+    # instead of checking for each period's default file separately
+    cwd_files = {entry.name for entry in os.scandir('.') if entry.is_file()}
+    
     for period in periods_available:
         print(f"\nPeriod {period}:")
         has_file = get_yes_no(f"  Do you have responses for Period {period}?", default='y')
         
         if has_file:
-            default_name = f"./Period_{period}_Responses.csv"
+            default_name = f"Period_{period}_Responses.csv"
             file_path = get_file_path(
                 f"  Enter path to Period {period} responses CSV",
-                default=default_name if os.path.exists(default_name) else None
+                default=f"./{default_name}" if default_name in cwd_files else None
             )
             form_files.append((file_path, period))
         else:
@@ -305,28 +347,36 @@ def main():
     
     print_section("Processing Submissions")
     
-    # Dictionary to store submissions by period
+    # Dictionary to store submissions by period. Each email is normalized
+    # and reduced to the part before the @ once, as it is read.
     completed_by_period = {}
     
-    for file_path, period in form_files:
-        print(f"\nProcessing Period {period}...")
+    # Start reading every response file at once. pandas' C parser releases
+    # the GIL, so on a small thread pool the files' reads overlap while
+    # earlier ones are being processed below.
+    with ThreadPoolExecutor(max_workers=min(8, len(form_files))) as executor:
+        form_reads = [executor.submit(read_form_usernames, file_path)
+                      for file_path, period in form_files]
         
-        try:
-            form_df = pd.read_csv(file_path)
-            
-            if 'Username' not in form_df.columns:
-                print(f"  ⚠ ERROR: No 'Username' column found in {file_path}")
-                completed_by_period[period] = set()
-                continue
-            
-            submitted_emails = set(form_df['Username'].str.lower().str.strip())
-            completed_by_period[period] = submitted_emails
+        for (file_path, period), form_read in zip(form_files, form_reads):
+            print(f"\nProcessing Period {period}...")
             
-            print(f"  ✓ Found {len(submitted_emails)} submission(s)")
-            
-        except Exception as e:
-            print(f"  ⚠ ERROR reading file: {e}")
-            completed_by_period[period] = set()
+            try:
+                form_df = form_read.result()
+                
+                if 'Username' not in form_df.columns:
+                    print(f"  ⚠ ERROR: No 'Username' column found in {file_path}")
+                    completed_by_period[period] = []
+                    continue
+                
+                submitted_emails = set(form_df['Username'].str.lower().str.strip())
+                completed_by_period[period] = [email.split('@', 1)[0] for email in submitted_emails]
+                
+                print(f"  ✓ Found {len(submitted_emails)} submission(s)")
+                
+            except Exception as e:
+                print(f"  ⚠ ERROR reading file: {e}")
+                completed_by_period[period] = []
     
     # ========================================================================
     # CREATE REPORT
@@ -334,83 +384,90 @@ def main():
     
     print("\nCreating completion report...")
     
-    report_data = []
+    completions = []
+    
+    # Index each period's emails once so most students are found with a
+    # single lookup (emails are already lowercased)
+    email_keys_by_period = {
+        period: {email_key(username) for username in usernames}
+        for period, usernames in completed_by_period.items()
+    }
     
-    for _, student in master_roster.iterrows():
-        period = student['Period']
-        student_name = student['Student Name']
+    # Walk the roster columns directly (iterrows() would build a Series per
+    # student); Course is optional
+    if 'Course' in master_roster.columns:
+        courses = master_roster['Course']
+    else:
+        courses = [''] * len(master_roster)
+    
+    for student_name, period in zip(master_roster['Student Name'], master_roster['Period']):
+        # No one can be matched in a period without a response file or whose
+        # file had no usernames, so skip the name handling entirely
+        usernames = completed_by_period.get(period)
+        if not usernames:
+            completions.append("No")
+            continue
         
-        # Extract name parts for matching
-        if ',' in student_name:
-            last_name, first_name = student_name.split(',', 1)
-            last_name = last_name.strip().lower().replace(' ', '').replace('-', '')
-            first_name = first_name.strip().lower().replace(' ', '').replace('-', '')
-        else:
-            parts = student_name.split()
-            if len(parts) >= 2:
-                first_name = parts[0].lower()
-                last_name = ' '.join(parts[1:]).lower().replace(' ', '').replace('-', '')
-            else:
-                first_name = student_name.lower()
-                last_name = ""
+        first_name, last_name = split_student_name(student_name)
         
         # Check if submitted
-        completed = "No"
-        if period in completed_by_period:
-            submitted_emails = completed_by_period[period]
-            for email in submitted_emails:
-                if first_name in email.lower() and last_name in email.lower():
-                    completed = "Yes"
-                    break
-        
-        report_data.append({
-            'Student Name': student_name,
-            'Period': period,
-            'Course': student.get('Course', ''),
-            assignment_name: completed
-        })
+        if has_submission(first_name, last_name, email_keys_by_period[period], usernames):
+            completions.append("Yes")
+        else:
+            completions.append("No")
+    
+    # Keep the report as one table; the workbook and the summary both read
+    # straight from its columns
+    report_df = master_roster[['Student Name', 'Period']].assign(
+        Course=list(courses), **{assignment_name: completions})
     
     # ========================================================================
     # CREATE EXCEL OUTPUT
     # ========================================================================
     
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Completion Report"
+    # Write-only mode streams rows straight to the file instead of keeping
+    # every cell in memory. Column widths must be set before any rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Completion Report")
+    
+    # Adjust column widths
+    ws.column_dimensions['A'].width = 30
+    ws.column_dimensions['B'].width = 8
+    ws.column_dimensions['C'].width = 12
+    ws.column_dimensions['D'].width = 20
     
     # Headers
     headers = ['Student Name', 'Period', 'Course', assignment_name]
     header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
     header_font = Font(bold=True, color='FFFFFF', size=11)
+    header_alignment = Alignment(horizontal='center')
     
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = header
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
         cell.fill = header_fill
         cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
     
     # Add data with color coding
+    # The status colors are registered once as named styles; each cell
+    # then just refers to a style by name
     yes_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
     no_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+    wb.add_named_style(NamedStyle(name='completed', fill=yes_fill))
+    wb.add_named_style(NamedStyle(name='not_completed', fill=no_fill))
     
-    for row_idx, record in enumerate(report_data, start=2):
-        ws.cell(row=row_idx, column=1, value=record['Student Name'])
-        ws.cell(row=row_idx, column=2, value=record['Period'])
-        ws.cell(row=row_idx, column=3, value=record['Course'])
+    for student_name, period, course, completed in report_df[headers].itertuples(index=False, name=None):
+        completion_cell = WriteOnlyCell(ws, value=completed)
         
-        completion_cell = ws.cell(row=row_idx, column=4, value=record[assignment_name])
-        
-        if record[assignment_name] == 'Yes':
-            completion_cell.fill = yes_fill
+        if completed == 'Yes':
+            completion_cell.style = 'completed'
         else:
-            completion_cell.fill = no_fill
-    
-    # Adjust column widths
-    ws.column_dimensions['A'].width = 30
-    ws.column_dimensions['B'].width = 8
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
+            completion_cell.style = 'not_completed'
+        
+        ws.append([student_name, period, course, completion_cell])
     
     # Save
     wb.save(output_path)
@@ -421,8 +478,12 @@ def main():
     
     print_section("Completion Report Created!")
     
-    total_students = len(report_data)
-    total_completed = sum(1 for r in report_data if r[assignment_name] == 'Yes')
+    # Count students and completions per period
+    is_completed = report_df[assignment_name] == 'Yes'
+    by_period = is_completed.groupby(report_df['Period']).agg(['sum', 'size'])
+    
+    total_students = len(report_df)
+    total_completed = int(is_completed.sum())
     total_percent = (total_completed / total_students * 100) if total_students > 0 else 0
     
     print(f"\n📊 Overall Results:")
@@ -431,10 +492,7 @@ def main():
     print(f"  • Not completed: {total_students - total_completed}")
     
     print(f"\n📊 By Period:")
-    for period in sorted(set(r['Period'] for r in report_data)):
-        period_data = [r for r in report_data if r['Period'] == period]
-        completed = sum(1 for r in period_data if r[assignment_name] == 'Yes')
-        total = len(period_data)
+    for period, completed, total in by_period.itertuples(name=None):
         percent = (completed / total * 100) if total > 0 else 0
         print(f"  Period {period}: {completed}/{total} ({percent:.1f}%)")
     
@@ -0,0 +1,245 @@
+"""
+ROSTER AND EMAIL HELPERS
+========================
+
+PURPOSE:
+    Shared helpers for the grading scripts in this folder: loading the
+    master roster (with a cache), reading Google Form usernames, and
+    matching roster names to student emails.
+
+    The scripts import this file directly, so keep it next to them:
+        from roster_utils import load_roster_cached, split_student_name
+
+AUTHOR: Educational Automation Library
+"""
+
+import hashlib
+import os
+import re
+import pandas as pd
+
+# Read Excel files with the much faster calamine engine when it is installed
+# (pip install python-calamine, needs pandas 2.2+); otherwise use openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Roster caches live in the user's own cache folder, never next to the roster
+ROSTER_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'edu_automation_library')
+
+# ============================================================================
+# ROSTER LOADING
+# ============================================================================
+
+def file_checksum(path):
+    """
+    Return the SHA-256 checksum of a file's contents.
+    
+    Args:
+        path (str): Path to the file
+    
+    Returns:
+        str: Hex digest of the file's bytes
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_roster_cached(path, columns=None):
+    """
+    Load the master roster, reusing a cached copy if the Excel file hasn't changed.
+    
+    Reading .xlsx files is slow, so only the needed columns are parsed, and
+    the loaded roster is pickled together with a SHA-256 checksum of the
+    Excel file. The cache is rebuilt whenever the file's contents (or the
+    set of columns asked for) change; unlike a modification time, the
+    checksum also catches a roster replaced by a copy with an older date.
+    
+    SECURITY: loading a pickle can run arbitrary code, so a cache file must
+    only ever come from this user. Caches are therefore kept in
+    ~/.cache/edu_automation_library/ (one per roster path), not beside the
+    roster, which may sit in a shared folder other people can write to.
+    Delete that folder to clear every cache.
+    
+    Args:
+        path (str): Path to the master roster Excel file
+        columns (tuple): Column names to keep (any that are missing are
+                         skipped), or None for all columns
+    
+    Returns:
+        DataFrame: The master roster
+    """
+    path_id = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+    cache_path = os.path.join(ROSTER_CACHE_DIR, f'roster_{path_id}.pkl')
+    cache_key = (file_checksum(path), columns)
+    
+    if os.path.exists(cache_path):
+        try:
+            cached_key, roster = pd.read_pickle(cache_path)
+            if cached_key == cache_key:
+                return roster
+        except Exception:
+            pass  # Unreadable cache - rebuild it below
+    
+    usecols = None if columns is None else (lambda column: column in columns)
+    roster = pd.read_excel(path, usecols=usecols, engine=EXCEL_ENGINE)
+    try:
+        os.makedirs(ROSTER_CACHE_DIR, exist_ok=True)
+        pd.to_pickle((cache_key, roster), cache_path)
+    except OSError:
+        pass  # Caching is optional (e.g. no writable home folder)
+    return roster
+
+def clean_roster(roster):
+    """
+    Drop unusable master roster rows and fix the name and period types.
+    
+    Blank or hand-edited rows (e.g. a totals row) with no name or period
+    are skipped; casting them would fail, or turn a missing name into 'nan'.
+    
+    Args:
+        roster (DataFrame): Roster with 'Student Name' and 'Period' columns
+    
+    Returns:
+        DataFrame: The remaining rows, with string names and int periods
+    """
+    roster = roster.dropna(subset=['Student Name', 'Period'])
+    return roster.astype({'Student Name': str, 'Period': int})
+
+# ============================================================================
+# FORM RESPONSES
+# ============================================================================
+
+def read_form_usernames(file_path):
+    """
+    Read the Username column of a Google Form responses CSV.
+    
+    Only the Username column is parsed, so the long answer text is never
+    converted. Blank cells are read as '' rather than NaN, so every
+    username is a string.
+    
+    Args:
+        file_path (str): Path to the form responses CSV
+    
+    Returns:
+        DataFrame: The Username column (no columns if the form has none)
+    """
+    return pd.read_csv(file_path, usecols=lambda col: col == 'Username', dtype=str,
+                       na_filter=False)
+
+# ============================================================================
+# NAME AND EMAIL MATCHING
+# ============================================================================
+
+# Anything that isn't a letter (dots, digits, hyphens, apostrophes, ...)
+NON_LETTERS = re.compile(r'[\W\d_]+')
+
+def split_student_name(student_name):
+    """
+    Split a roster name into normalized first and last names for email matching.
+    
+    Handles "Last, First" and "First Last" formats.
+    
+    Args:
+        student_name (str): Name as "Last, First" or "First Last"
+        
+    Returns:
+        tuple: (first, last), lowercased with spaces and hyphens removed
+    """
+    if ',' in student_name:
+        last_name, first_name = student_name.split(',', 1)
+        last_name = last_name.strip()
+        first_name = first_name.strip()
+    else:
+        # Handle names without comma
+        parts = student_name.split()
+        if len(parts) >= 2:
+            first_name = parts[0]
+            last_name = ' '.join(parts[1:])
+        else:
+            first_name = student_name
+            last_name = ""
+    
+    first_lower = first_name.lower().replace(' ', '').replace('-', '')
+    last_lower = last_name.lower().replace(' ', '').replace('-', '')
+    return first_lower, last_lower
+
+def email_key(email):
+    """
+    Reduce an email (or a bare username) to the letters of its local part.
+    
+    Example: 'maria.garcia123@school.edu' -> 'mariagarcia'
+    """
+    return NON_LETTERS.sub('', email.split('@', 1)[0])
+
+def build_submission_index(submissions):
+    """
+    Index submissions by the letters of each email's local part.
+    
+    Args:
+        submissions (dict): Lowercased email -> response text
+    
+    Returns:
+        dict: email_key -> (email, response text); the first email wins
+              if two emails reduce to the same key
+    """
+    index = {}
+    for email, answer_text in submissions.items():
+        index.setdefault(email_key(email), (email, answer_text))
+    return index
+
+def match_submissions(name_parts, submissions):
+    """
+    Match each student to at most one submission by email.
+    
+    Most emails follow a firstname.lastname### (or lastname.firstname###)
+    pattern, so every student is first looked up directly in an index under
+    both name orders. Only then are the students still unmatched checked
+    against the unclaimed emails for both name parts as substrings. Doing
+    the exact pass first for everyone keeps a student whose name is part of
+    a classmate's (Lee, Ann and Lee, Anna) from taking the classmate's
+    submission.
+    
+    Each email is claimed by at most one student, so two students with the
+    same name don't both get credit for one submission.
+    
+    Args:
+        name_parts (list): (first name, last name) per student, normalized
+                           with split_student_name()
+        submissions (dict): Lowercased email -> response text
+    
+    Returns:
+        list: (email, response text) per student in name_parts order, or
+              (None, None) for students with no match
+    """
+    submission_index = build_submission_index(submissions)
+    matches = [(None, None)] * len(name_parts)
+    
+    # Pass 1: exact lookups for every student
+    for idx, (first_name, last_name) in enumerate(name_parts):
+        for key in (first_name + last_name, last_name + first_name):
+            key = NON_LETTERS.sub('', key)
+            if key in submission_index:
+                matches[idx] = submission_index.pop(key)
+                break
+    
+    # Pass 2: substring search over the emails nobody claimed exactly.
+    # Hyphens are stripped once here to match the cleaned names.
+    claimed = {email for email, _ in matches if email is not None}
+    candidates = {email: email.replace('-', '') for email in submissions if email not in claimed}
+    for idx, (first_name, last_name) in enumerate(name_parts):
+        if not candidates:
+            break
+        if matches[idx][0] is not None:
+            continue
+        for email, email_clean in candidates.items():
+            if first_name in email_clean and last_name in email_clean:
+                del candidates[email]
+                matches[idx] = (email, submissions[email])
+                break
+    
+    return matches
@@ -56,10 +56,12 @@ EXAMPLE:
         Contains all students from both periods in one organized list
 """
 
-import csv
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
 
 # ============================================================================
 # CONFIGURATION - UPDATE THESE PATHS FOR YOUR FILES
@@ -81,6 +83,26 @@ output_path = '/mnt/user-data/outputs/Master_Class_Roster_Spring_2026.xlsx'
 # MAIN SCRIPT - NO NEED TO MODIFY BELOW THIS LINE
 # ============================================================================
 
+def read_roster_csv(file_path, **options):
+    """
+    Read a roster CSV as UTF-8, or as cp1252 if it isn't valid UTF-8.
+    
+    Gradebook exports are usually UTF-8 (sometimes with a byte order mark),
+    but Excel on Windows saves CSV files as cp1252, where accented names
+    (e.g. "Peña, José") are not valid UTF-8.
+    
+    Args:
+        file_path (str): Path to the CSV roster file
+        **options: Other pandas.read_csv arguments
+        
+    Returns:
+        DataFrame: The parsed CSV
+    """
+    try:
+        return pd.read_csv(file_path, encoding='utf-8-sig', **options)
+    except UnicodeDecodeError:
+        return pd.read_csv(file_path, encoding='cp1252', **options)
+
 def extract_student_data(file_path, period, course):
     """
     Extract student information from a roster CSV file.
@@ -91,68 +113,82 @@ def extract_student_data(file_path, period, course):
         course (str): Course code/name
         
     Returns:
-        list: List of dictionaries containing student information
+        DataFrame: One row per student with Student Name, Grade, Student ID,
+                   Period and Course columns
     """
-    students = []
-    
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    reader = csv.reader(lines)
-    roster_data = list(reader)
+    columns = ['Student Name', 'Grade', 'Student ID']
     
     # Student data starts at row 9 (index 9)
     # Columns: [1] = Name, [2] = Grade, [3] = Student Number
-    for idx in range(9, len(roster_data)):
-        row = roster_data[idx]
-        
-        if len(row) > 3:
-            student_name = row[1] if len(row) > 1 else ""
-            grade = row[2] if len(row) > 2 else ""
-            student_id = row[3] if len(row) > 3 else ""
-            
-            # Only add if we have valid data
-            if student_name and student_name.strip() and student_id and student_id.strip():
-                students.append({
-                    'Student Name': student_name.strip(),
-                    'Grade': grade.strip(),
-                    'Student ID': student_id.strip(),
-                    'Period': period,
-                    'Course': course
-                })
+    # Everything is read as text so leading zeros in IDs are kept.
+    # The width is fixed at four columns: left to itself, read_csv sizes the
+    # table from the first row after the skip, and a short row there (e.g.
+    # "Class average,,") would leave every student without an ID. Extra
+    # fields on wider rows are dropped and short rows are padded with ''.
+    try:
+        students = read_roster_csv(file_path, skiprows=9, header=None,
+                                   names=['Indicators'] + columns, index_col=False,
+                                   usecols=columns, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        students = pd.DataFrame(columns=columns, dtype=str)
     
-    return students
-
-# List to store all students
-all_students = []
+    students = students.fillna('')
+    for column in columns:
+        students[column] = students[column].str.strip()
+    
+    # Only keep rows with valid data
+    students = students[(students['Student Name'] != '') & (students['Student ID'] != '')]
+    
+    return students.assign(Period=period, Course=course)
 
 # Process each roster file
 print("Processing roster files...")
 print("=" * 70)
 
-for file_path, period, course in rosters:
-    print(f"\nProcessing {course} Period {period}...")
+# Start reading every roster at once. pandas' C parser releases the GIL,
+# so on a small thread pool the files' reads overlap.
+roster_frames = []
+with ThreadPoolExecutor(max_workers=max(1, min(8, len(rosters)))) as executor:
+    roster_reads = [executor.submit(extract_student_data, file_path, period, course)
+                    for file_path, period, course in rosters]
     
-    students = extract_student_data(file_path, period, course)
-    
-    for student in students:
-        all_students.append(student)
-        print(f"  Added: {student['Student Name']}")
+    for (file_path, period, course), roster_read in zip(rosters, roster_reads):
+        print(f"\nProcessing {course} Period {period}...")
+        
+        students = roster_read.result()
+        roster_frames.append(students)
+        
+        # One write per file instead of one print() per student
+        if not students.empty:
+            print('\n'.join(f"  Added: {student_name}" for student_name in students['Student Name']))
+
+# Combine all periods into one table
+all_students = pd.concat(roster_frames, ignore_index=True)
 
 print(f"\n{'=' * 70}")
 print(f"Total students collected: {len(all_students)}")
 print("=" * 70)
 
 # Sort by period, then by student name
-all_students.sort(key=lambda x: (x['Period'], x['Student Name']))
+all_students = all_students.sort_values(['Period', 'Student Name'], kind='stable')
 
 # ============================================================================
 # CREATE EXCEL WORKBOOK WITH FORMATTING
 # ============================================================================
 
-wb = Workbook()
-ws = wb.active
-ws.title = "Master Roster"
+# Write-only mode streams rows straight to the file instead of keeping
+# every cell in memory. Column widths must be set before any rows.
+wb = Workbook(write_only=True)
+ws = wb.create_sheet("Master Roster")
+
+# Adjust column widths for readability
+column_widths = (30,  # Student Name
+                 8,   # Grade
+                 12,  # Student ID
+                 8,   # Period
+                 12)  # Course
+for column, width in enumerate(column_widths, start=1):
+    ws.column_dimensions[get_column_letter(column)].width = width
 
 # Define headers
 headers = ['Student Name', 'Grade', 'Student ID', 'Period', 'Course']
@@ -162,28 +198,22 @@ header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='s
 header_font = Font(bold=True, color='FFFFFF', size=12)
 header_alignment = Alignment(horizontal='center', vertical='center')
 
+# Register the header look once as a named style; each header cell then
+# just refers to it by name
+wb.add_named_style(NamedStyle(name='header', fill=header_fill, font=header_font,
+                              alignment=header_alignment))
+
 # Add headers with styling
-for col_idx, header in enumerate(headers, start=1):
-    cell = ws.cell(row=1, column=col_idx)
-    cell.value = header
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.alignment = header_alignment
-
-# Add student data
-for row_idx, student in enumerate(all_students, start=2):
-    ws.cell(row=row_idx, column=1, value=student['Student Name'])
-    ws.cell(row=row_idx, column=2, value=student['Grade'])
-    ws.cell(row=row_idx, column=3, value=student['Student ID'])
-    ws.cell(row=row_idx, column=4, value=student['Period'])
-    ws.cell(row=row_idx, column=5, value=student['Course'])
+header_cells = []
+for header in headers:
+    cell = WriteOnlyCell(ws, value=header)
+    cell.style = 'header'
+    header_cells.append(cell)
+ws.append(header_cells)
 
-# Adjust column widths for readability
-ws.column_dimensions['A'].width = 30  # Student Name
-ws.column_dimensions['B'].width = 8   # Grade
-ws.column_dimensions['C'].width = 12  # Student ID
-ws.column_dimensions['D'].width = 8   # Period
-ws.column_dimensions['E'].width = 12  # Course
+# Add student data, one appended row per student
+for row in all_students[headers].itertuples(index=False, name=None):
+    ws.append(list(row))
 
 # Save the workbook
 wb.save(output_path)
@@ -200,12 +230,10 @@ print(f"\nBreakdown by period:")
 print("-" * 70)
 
 # Count students by period
-period_counts = {}
-for student in all_students:
-    key = f"Period {student['Period']} ({student['Course']})"
-    period_counts[key] = period_counts.get(key, 0) + 1
+period_labels = 'Period ' + all_students['Period'].astype(str) + ' (' + all_students['Course'] + ')'
+period_counts = period_labels.value_counts().sort_index()
 
-for period, count in sorted(period_counts.items()):
+for period, count in period_counts.items():
     print(f"  {period}: {count} students")
 
 print("\n" + "=" * 70)
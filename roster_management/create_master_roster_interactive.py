@@ -12,17 +12,24 @@ USAGE:
     
     Or for help:
     python create_master_roster_interactive.py --help
+    
+    Or without prompts (batch mode), one --roster per period:
+    python create_master_roster_interactive.py \\
+        --roster Period_1_Roster.csv:1:APCSP --roster Period_4_Roster.csv:4:ACS1 \\
+        --output Master_Class_Roster.xlsx
 
 AUTHOR: Educational Automation Library
 VERSION: 2.0 (Interactive)
 """
 
 import sys
+import argparse
 import os
-import csv
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
 
 # ============================================================================
 # HELP DOCUMENTATION
@@ -89,6 +96,15 @@ WORKFLOW:
     4. Enter file paths when prompted
     5. Get one master roster Excel file
 
+BATCH MODE (NO PROMPTS):
+    Give each roster as --roster PATH:PERIOD:COURSE and, optionally, the
+    output file with --output (default ./Master_Class_Roster.xlsx).
+    Nothing is written if a roster file is missing (exit status 2) or is
+    unreadable or has no students (exit status 1):
+    
+    python create_master_roster_interactive.py --roster P1.csv:1:APCSP \\
+        --roster P4.csv:4:ACS1 --output Master_Class_Roster.xlsx
+
 TIPS:
     • Keep roster files in a consistent folder structure
     • Use clear file naming: COURSE_Semester_Period_#_Roster.csv
@@ -161,6 +177,26 @@ def get_yes_no(prompt, default='y'):
     
     return response in ['y', 'yes']
 
+def read_roster_csv(file_path, **options):
+    """
+    Read a roster CSV as UTF-8, or as cp1252 if it isn't valid UTF-8.
+    
+    Gradebook exports are usually UTF-8 (sometimes with a byte order mark),
+    but Excel on Windows saves CSV files as cp1252, where accented names
+    (e.g. "Peña, José") are not valid UTF-8.
+    
+    Args:
+        file_path: Path to the CSV roster file
+        **options: Other pandas.read_csv arguments
+        
+    Returns:
+        DataFrame: The parsed CSV
+    """
+    try:
+        return pd.read_csv(file_path, encoding='utf-8-sig', **options)
+    except UnicodeDecodeError:
+        return pd.read_csv(file_path, encoding='cp1252', **options)
+
 def extract_student_data(file_path, period, course):
     """
     Extract student information from a roster CSV file.
@@ -171,53 +207,217 @@ def extract_student_data(file_path, period, course):
         course: Course code/name
         
     Returns:
-        list: List of dictionaries containing student information
+        DataFrame: One row per student with Student Name, Grade, Student ID,
+                   Period and Course columns (empty if the file can't be read)
     """
-    students = []
+    columns = ['Student Name', 'Grade', 'Student ID']
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        reader = csv.reader(lines)
-        roster_data = list(reader)
-        
         # Student data typically starts at row 9 (index 9)
-        for idx in range(9, len(roster_data)):
-            row = roster_data[idx]
-            
-            if len(row) > 3:
-                student_name = row[1] if len(row) > 1 else ""
-                grade = row[2] if len(row) > 2 else ""
-                student_id = row[3] if len(row) > 3 else ""
-                
-                # Only add if we have valid data
-                if student_name and student_name.strip() and student_id and student_id.strip():
-                    students.append({
-                        'Student Name': student_name.strip(),
-                        'Grade': grade.strip(),
-                        'Student ID': student_id.strip(),
-                        'Period': period,
-                        'Course': course
-                    })
-    
+        # Everything is read as text so leading zeros in IDs are kept.
+        # The width is fixed at four columns so a short first row (e.g.
+        # "Class average,,") can't make read_csv drop the ID column; extra
+        # fields on wider rows are ignored and short rows padded with ''.
+        students = read_roster_csv(file_path, skiprows=9, header=None,
+                                   names=['Indicators'] + columns, index_col=False,
+                                   usecols=columns, dtype=str, keep_default_na=False)
+    
+    except pd.errors.EmptyDataError:
+        students = pd.DataFrame(columns=columns, dtype=str)
     except Exception as e:
         print(f"  ⚠ Error reading file: {e}")
-        return []
+        students = pd.DataFrame(columns=columns, dtype=str)
+    
+    students = students.fillna('')
+    for column in columns:
+        students[column] = students[column].str.strip()
+    
+    # Only keep rows with valid data
+    students = students[(students['Student Name'] != '') & (students['Student ID'] != '')]
+    
+    return students.assign(Period=period, Course=course)
+
+# ============================================================================
+# MASTER ROSTER BUILD
+# ============================================================================
+
+def parse_roster_spec(spec):
+    """
+    Parse a --roster argument of the form PATH:PERIOD:COURSE.
+    
+    The path is everything before the last two colons, so Windows paths
+    such as C:\\Rosters\\P1.csv work.
+    
+    Args:
+        spec: The argument text, e.g. "Period_1_Roster.csv:1:APCSP"
+        
+    Returns:
+        tuple: (file_path, period, course)
+    """
+    try:
+        file_path, period, course = spec.rsplit(':', 2)
+        return file_path, int(period), course
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected PATH:PERIOD:COURSE (e.g. Period_1_Roster.csv:1:APCSP), got '{spec}'")
+
+def build_master_roster(rosters, output_path):
+    """
+    Combine the parsed period rosters, save the master roster, and print a summary.
+    
+    Args:
+        rosters: List of (file_path, period, course, students) where students
+                 is the DataFrame returned by extract_student_data
+        output_path: Where to save the master roster Excel file
+        
+    Returns:
+        bool: True if the master roster was saved, False if no file
+              had any students (nothing is written)
+    """
+    print_section("Processing Rosters")
+    
+    roster_frames = []
+    
+    for file_path, period, course, students in rosters:
+        print(f"\nProcessing {course} Period {period}...")
+        
+        if not students.empty:
+            print(f"  ✓ Added {len(students)} student(s)")
+            roster_frames.append(students)
+        else:
+            print(f"  ⚠ No students found in this file")
+    
+    if not roster_frames:
+        print("\n  ⚠ No students extracted from any files!")
+        print("  Please check your roster file format and try again.")
+        return False
+    
+    # Combine all periods into one table
+    all_students = pd.concat(roster_frames, ignore_index=True)
+    
+    print(f"\n  ✓ Total students collected: {len(all_students)}")
+    
+    # Sort by period, then by name (a single roster is all one period, so
+    # its names are all that need sorting)
+    sort_columns = ['Student Name'] if len(roster_frames) == 1 else ['Period', 'Student Name']
+    all_students = all_students.sort_values(sort_columns, kind='stable')
+    
+    # ========================================================================
+    # CREATE EXCEL WORKBOOK
+    # ========================================================================
+    
+    print("\nCreating Excel workbook...")
+    
+    # Write-only mode streams rows straight to the file instead of keeping
+    # every cell in memory. Column widths must be set before any rows.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Master Roster")
+    
+    # Adjust column widths (Student Name, Grade, Student ID, Period, Course)
+    for column, width in enumerate((30, 8, 12, 8, 12), start=1):
+        ws.column_dimensions[get_column_letter(column)].width = width
+    
+    # Headers
+    headers = ['Student Name', 'Grade', 'Student ID', 'Period', 'Course']
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=12)
+    header_alignment = Alignment(horizontal='center', vertical='center')
+    
+    # Register the header look once as a named style; each header cell then
+    # just refers to it by name
+    wb.add_named_style(NamedStyle(name='header', fill=header_fill, font=header_font,
+                                  alignment=header_alignment))
+    
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.style = 'header'
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    # Add student data, one appended row per student
+    for row in all_students[headers].itertuples(index=False, name=None):
+        ws.append(list(row))
+    
+    # Save
+    wb.save(output_path)
+    
+    # ========================================================================
+    # SUMMARY
+    # ========================================================================
+    
+    print_section("Master Roster Created!")
+    
+    print(f"\n📊 Summary:")
+    print(f"  • Total students: {len(all_students)}")
+    
+    # Count by period
+    period_labels = 'Period ' + all_students['Period'].astype(str) + ' (' + all_students['Course'] + ')'
+    period_counts = period_labels.value_counts().sort_index()
+    
+    print(f"\n📊 By Period:")
+    for period, count in period_counts.items():
+        print(f"  • {period}: {count} students")
     
-    return students
+    print(f"\n💾 Master roster saved to:")
+    print(f"  {output_path}")
+    
+    print("\n" + "="*78)
+    print("Next steps:")
+    print("  1. Open the Excel file to verify all students are present")
+    print("  2. Keep this file - other scripts will use it as input")
+    print("  3. Update it whenever roster changes occur")
+    print("="*78 + "\n")
+    
+    return True
 
 # ============================================================================
 # MAIN INTERACTIVE SCRIPT
 # ============================================================================
 
 def main():
-    """Main interactive workflow."""
+    """Main interactive workflow (or batch mode when --roster is given)."""
+    
+    # HELP_TEXT replaces argparse's own help
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-h', '--help', action='store_true')
+    parser.add_argument('-r', '--roster', action='append', type=parse_roster_spec,
+                        metavar='PATH:PERIOD:COURSE')
+    parser.add_argument('-o', '--output', default='./Master_Class_Roster.xlsx')
+    args = parser.parse_args()
     
     # Check for help flag
-    if '--help' in sys.argv or '-h' in sys.argv:
+    if args.help:
         print(HELP_TEXT)
-        input()
+        if sys.stdin.isatty():  # Only wait when someone is at the keyboard
+            input()
+        return
+    
+    # Batch mode: everything comes from the command line, so skip the prompts
+    if args.roster:
+        output_path = args.output
+        if not output_path.endswith('.xlsx'):
+            output_path += '.xlsx'
+        
+        # Fail before reading anything if a roster file is missing
+        for file_path, period, course in args.roster:
+            if not os.path.isfile(file_path):
+                parser.error(f"roster file not found: {file_path}")
+        
+        rosters = [(file_path, period, course, extract_student_data(file_path, period, course))
+                   for file_path, period, course in args.roster]
+        
+        # A file that can't be read (or has no students) would silently be
+        # left out of the master roster, so stop without writing anything
+        empty_files = [file_path for file_path, _, _, students in rosters if students.empty]
+        if empty_files:
+            for file_path in empty_files:
+                print(f"  ⚠ No students found in: {file_path}")
+            print("\n  No master roster was written.")
+            sys.exit(1)
+        
+        if not build_master_roster(rosters, output_path):
+            sys.exit(1)
         return
     
     print_header()
@@ -227,7 +427,8 @@ def main():
     
     if get_yes_no("Would you like to see detailed help before starting?", default='n'):
         print(HELP_TEXT)
-        input("Press Enter to continue...")
+        if sys.stdin.isatty():
+            input("Press Enter to continue...")
     
     # ========================================================================
     # STEP 1: Collect Roster Files
@@ -237,6 +438,8 @@ def main():
     print("I'll ask you for each class period roster CSV file.")
     print("These should be exported from your gradebook system.\n")
     
+    # (file path, period, course, students) for each roster; each file is
+    # parsed once here and the result reused when building the master roster
     rosters = []
     
     # Ask how many periods
@@ -251,6 +454,10 @@ def main():
     
     print(f"\n  ✓ Will collect roster information for {num_periods} period(s)\n")
     
+    # List the current folder once to offer default roster paths, instead
+    # of checking for each period's default file separately
+    cwd_files = {entry.name for entry in os.scandir('.') if entry.is_file()}
+    
     # Collect each roster
     for i in range(num_periods):
         print(f"\n── Period {i+1} ──")
@@ -269,22 +476,22 @@ def main():
         course_code = get_input("  Course code", default="APCSP")
         
         # Get file path
-        default_path = f"./Period_{period_num}_Roster.csv"
+        default_name = f"Period_{period_num}_Roster.csv"
         file_path = get_file_path(
             "  Enter path to roster CSV file",
-            default=default_path if os.path.exists(default_path) else None
+            default=f"./{default_name}" if default_name in cwd_files else None
         )
         
         # Test read the file
         test_students = extract_student_data(file_path, period_num, course_code)
         
-        if test_students:
+        if not test_students.empty:
             print(f"  ✓ Successfully read {len(test_students)} student(s)")
-            rosters.append((file_path, period_num, course_code))
+            rosters.append((file_path, period_num, course_code, test_students))
         else:
             print(f"  ⚠ Warning: No students found in this file")
             if get_yes_no("  Add it anyway?", default='n'):
-                rosters.append((file_path, period_num, course_code))
+                rosters.append((file_path, period_num, course_code, test_students))
     
     if not rosters:
         print("\n  ⚠ No roster files added. Nothing to process!")
@@ -326,104 +533,7 @@ def main():
         print("\n  Cancelled. No files were created.")
         return
     
-    # ========================================================================
-    # PROCESSING
-    # ========================================================================
-    
-    print_section("Processing Rosters")
-    
-    all_students = []
-    
-    for file_path, period, course in rosters:
-        print(f"\nProcessing {course} Period {period}...")
-        
-        students = extract_student_data(file_path, period, course)
-        
-        if students:
-            print(f"  ✓ Added {len(students)} student(s)")
-            all_students.extend(students)
-        else:
-            print(f"  ⚠ No students found in this file")
-    
-    if not all_students:
-        print("\n  ⚠ No students extracted from any files!")
-        print("  Please check your roster file format and try again.")
-        return
-    
-    print(f"\n  ✓ Total students collected: {len(all_students)}")
-    
-    # Sort by period, then by name
-    all_students.sort(key=lambda x: (x['Period'], x['Student Name']))
-    
-    # ========================================================================
-    # CREATE EXCEL WORKBOOK
-    # ========================================================================
-    
-    print("\nCreating Excel workbook...")
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Master Roster"
-    
-    # Headers
-    headers = ['Student Name', 'Grade', 'Student ID', 'Period', 'Course']
-    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    header_font = Font(bold=True, color='FFFFFF', size=12)
-    header_alignment = Alignment(horizontal='center', vertical='center')
-    
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-    
-    # Add student data
-    for row_idx, student in enumerate(all_students, start=2):
-        ws.cell(row=row_idx, column=1, value=student['Student Name'])
-        ws.cell(row=row_idx, column=2, value=student['Grade'])
-        ws.cell(row=row_idx, column=3, value=student['Student ID'])
-        ws.cell(row=row_idx, column=4, value=student['Period'])
-        ws.cell(row=row_idx, column=5, value=student['Course'])
-    
-    # Adjust column widths
-    ws.column_dimensions['A'].width = 30
-    ws.column_dimensions['B'].width = 8
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 8
-    ws.column_dimensions['E'].width = 12
-    
-    # Save
-    wb.save(output_path)
-    
-    # ========================================================================
-    # SUMMARY
-    # ========================================================================
-    
-    print_section("Master Roster Created!")
-    
-    print(f"\n📊 Summary:")
-    print(f"  • Total students: {len(all_students)}")
-    
-    # Count by period
-    period_counts = {}
-    for student in all_students:
-        key = f"Period {student['Period']} ({student['Course']})"
-        period_counts[key] = period_counts.get(key, 0) + 1
-    
-    print(f"\n📊 By Period:")
-    for period, count in sorted(period_counts.items()):
-        print(f"  • {period}: {count} students")
-    
-    print(f"\n💾 Master roster saved to:")
-    print(f"  {output_path}")
-    
-    print("\n" + "="*78)
-    print("Next steps:")
-    print("  1. Open the Excel file to verify all students are present")
-    print("  2. Keep this file - other scripts will use it as input")
-    print("  3. Update it whenever roster changes occur")
-    print("="*78 + "\n")
+    build_master_roster(rosters, output_path)
 
 # ============================================================================
 # ENTRY POINT
@@ -0,0 +1,75 @@
+"""
+Regression checks for matching roster names to Google Form emails.
+
+The graders are standalone scripts rather than an installed package, so
+they are loaded straight from their paths, with grading/ on sys.path for
+their shared roster_utils import.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'grading'))
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, ROOT / 'grading' / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+grade_ace_writing = load_script('grade_ace_writing')
+grade_ace_writing_interactive = load_script('grade_ace_writing_interactive')
+
+ANSWER = ('Magma rises because pressure from gas builds up. The text states that '
+          '"lava erupts". This shows the gas pushes magma out of the volcano.')
+
+
+def write_responses(tmp_path, rows):
+    path = tmp_path / 'responses.csv'
+    lines = ['Timestamp,Username,Response']
+    lines += [f'1/27/2026 8:30:00,{email},"{answer}"' for email, answer in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_prefix_name_does_not_take_exact_match_batch_grader(tmp_path):
+    # Ann used to claim anna.lee@ through the substring fallback before
+    # Anna's exact lookup ran, leaving the real submitter with a zero
+    path = write_responses(tmp_path, [('anna.lee@school.edu', ANSWER)])
+
+    results = grade_ace_writing.grade_period(path, 1, ['Lee, Ann', 'Lee, Anna'])
+
+    emails = {name: email for name, email, *_ in results}
+    assert emails == {'Lee, Ann': None, 'Lee, Anna': 'anna.lee@school.edu'}
+
+
+def test_prefix_name_does_not_take_exact_match_interactive_grader(tmp_path):
+    path = write_responses(tmp_path, [('anna.lee@school.edu', ANSWER)])
+    students = [(name, *grade_ace_writing_interactive.split_student_name(name))
+                for name in ['Lee, Ann', 'Lee, Anna']]
+
+    count, rows = grade_ace_writing_interactive.grade_period(
+        path, 1, students, ['magma', 'lava', 'pressure', 'gas'], [], [])
+
+    emails = {name: email for _, name, email, *_ in rows}
+    assert count == 1
+    assert emails == {'Lee, Ann': 'Not submitted', 'Lee, Anna': 'anna.lee@school.edu'}
+
+
+def test_substring_match_still_used_after_exact_pass(tmp_path):
+    # A student with no exact email is still found by the fallback, but
+    # only among the emails no one claimed exactly
+    path = write_responses(tmp_path, [
+        ('anna.lee@school.edu', ANSWER),
+        ('mr.ann.lee.7@school.edu', ANSWER),
+    ])
+
+    results = grade_ace_writing.grade_period(path, 1, ['Lee, Ann', 'Lee, Anna'])
+
+    emails = {name: email for name, email, *_ in results}
+    assert emails == {'Lee, Ann': 'mr.ann.lee.7@school.edu',
+                      'Lee, Anna': 'anna.lee@school.edu'}
@@ -0,0 +1,129 @@
+"""
+Regression checks for reading gradebook roster CSVs and for the master
+roster script's batch mode.
+
+The scripts are standalone files rather than an installed package, so the
+interactive master roster script is loaded straight from its path.
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+spec = importlib.util.spec_from_file_location(
+    'create_master_roster_interactive',
+    ROOT / 'roster_management' / 'create_master_roster_interactive.py')
+create_master_roster_interactive = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(create_master_roster_interactive)
+
+# Nine lines of gradebook header, then the student rows
+HEADER_LINES = [
+    'Teacher:,"Smith, Jane"',
+    'Course:,APCSP,Period: 1',
+    '', '', '', '',
+    'Indicators,Student Name,Grade,Student Number,A1',
+    '', '',
+]
+
+
+def write_roster(tmp_path, rows):
+    path = tmp_path / 'roster.csv'
+    path.write_text('\n'.join(HEADER_LINES + rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_short_first_data_row_keeps_student_ids(tmp_path):
+    # A short first row used to make read_csv size the table to three
+    # columns, so every Student ID came back empty and no one was kept
+    path = write_roster(tmp_path, [
+        'Class average,,',
+        ',"Garcia, Maria",10,012345,9',
+        ',"Lee, Ann",9,012346,9,extra',
+        ',"No ID, Student",9',
+    ])
+
+    students = create_master_roster_interactive.extract_student_data(path, 1, 'APCSP')
+
+    assert students.values.tolist() == [
+        ['Garcia, Maria', '10', '012345', 1, 'APCSP'],
+        ['Lee, Ann', '9', '012346', 1, 'APCSP'],
+    ]
+
+
+def test_cp1252_roster_export_is_read(tmp_path):
+    # Excel on Windows saves CSVs as cp1252, so accented names are not
+    # valid UTF-8; the roster is read with the cp1252 fallback instead
+    path = tmp_path / 'roster.csv'
+    rows = [',"Peña, José",10,012345,9']
+    path.write_bytes(('\n'.join(HEADER_LINES + rows) + '\n').encode('cp1252'))
+
+    students = create_master_roster_interactive.extract_student_data(str(path), 1, 'APCSP')
+
+    assert students.values.tolist() == [['Peña, José', '10', '012345', 1, 'APCSP']]
+
+
+# ============================================================================
+# BATCH MODE
+# ============================================================================
+
+SCRIPT = ROOT / 'roster_management' / 'create_master_roster_interactive.py'
+
+
+def run_batch(*args):
+    return subprocess.run([sys.executable, str(SCRIPT), *args],
+                          capture_output=True, text=True, stdin=subprocess.DEVNULL)
+
+
+def test_roster_spec_keeps_colons_in_path():
+    parse_roster_spec = create_master_roster_interactive.parse_roster_spec
+
+    assert parse_roster_spec('Period_1_Roster.csv:1:APCSP') == ('Period_1_Roster.csv', 1, 'APCSP')
+    assert parse_roster_spec('C:\\Rosters\\P4.csv:4:ACS1') == ('C:\\Rosters\\P4.csv', 4, 'ACS1')
+
+
+def test_bad_roster_spec_is_rejected():
+    for spec in ('Period_1_Roster.csv', 'Period_1_Roster.csv:one:APCSP'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            create_master_roster_interactive.parse_roster_spec(spec)
+
+
+def test_batch_missing_roster_file_is_a_usage_error(tmp_path):
+    good = write_roster(tmp_path, [',"Garcia, Maria",10,012345,9'])
+    output = tmp_path / 'master.xlsx'
+
+    result = run_batch('-r', f'{good}:1:APCSP', '-r', f'{tmp_path / "nope.csv"}:3:APCSP',
+                       '-o', str(output))
+
+    assert result.returncode == 2
+    assert 'roster file not found' in result.stderr
+    assert not output.exists()
+
+
+def test_batch_roster_without_students_writes_nothing(tmp_path):
+    good = write_roster(tmp_path, [',"Garcia, Maria",10,012345,9'])
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('')
+    output = tmp_path / 'master.xlsx'
+
+    result = run_batch('-r', f'{good}:1:APCSP', '-r', f'{empty}:3:APCSP', '-o', str(output))
+
+    assert result.returncode == 1
+    assert not output.exists()
+
+
+def test_batch_writes_master_roster(tmp_path):
+    good = write_roster(tmp_path, [',"Garcia, Maria",10,012345,9'])
+    output = tmp_path / 'master.xlsx'
+
+    result = run_batch('-r', f'{good}:1:APCSP', '-o', str(output))
+
+    assert result.returncode == 0
+    assert pd.read_excel(output, dtype=str).values.tolist() == [
+        ['Garcia, Maria', '10', '012345', '1', 'APCSP']]